@@ -0,0 +1,26 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:58
+
+from django.db import migrations
+
+
+# 가입 시점 생성 전에 만들어진 사용자의 데이터 버전 행 채우기 (조회에서는 더 이상 만들지 않음)
+def fill_data_versions(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    DataVersion = apps.get_model("accounts", "DataVersion")
+    missing = User.objects.filter(data_version__isnull=True).values_list("id", flat=True)
+    DataVersion.objects.bulk_create(
+        [DataVersion(user_id=user_id) for user_id in missing.iterator()],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_dataversion'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_data_versions, migrations.RunPython.noop),
+    ]
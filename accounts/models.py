@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 
 #본교 
 class University(models.Model):
@@ -76,4 +77,21 @@ class ExchangeProfile(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.user.username} - {self.exchange_univ.univ_name if self.exchange_univ else 'No Exchange University'}"
\ No newline at end of file
+        return f"{self.user.username} - {self.exchange_univ.univ_name if self.exchange_univ else 'No Exchange University'}"
+
+# 사용자별 데이터 버전 (가계부/예산안/교환 프로필이 바뀔 때마다 증가, ETag에 사용)
+class DataVersion(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="data_version")
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def current(cls, user_id):
+        # 조회에서는 쓰지 않음, 행은 가입 때 만들어짐 (accounts/signals.py) -> 없으면 0
+        version = cls.objects.filter(pk=user_id).values_list("version", flat=True).first()
+        return version or 0
+
+    @classmethod
+    def bump(cls, user_id):
+        # 행이 없으면 올리지 않음 (탈퇴로 삭제 중인 사용자의 행을 다시 만들지 않기 위함)
+        cls.objects.filter(pk=user_id).update(version=models.F("version") + 1, updated_at=timezone.now())
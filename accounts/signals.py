@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from budgets.models import BaseBudget, BaseBudgetItem, Budget, LivingBudget, LivingBudgetItem
+from ledgers.models import LedgerEntry
+from .models import DataVersion, ExchangeProfile, User
+from .versioning import bump_data_version
+
+# 다른 입력값을 따라 다시 계산되는 파생 필드만 바뀐 경우는 데이터 변경으로 보지 않음 (원래 변경에서 이미 증가)
+# updated_at은 파생 필드와 함께 저장될 때 자동으로 바뀌는 값
+DERIVED_FIELDS = {"total_budget", "total_amount_krw", "updated_at"}
+
+
+def _owner_id(instance):
+    if isinstance(instance, (LedgerEntry, Budget, ExchangeProfile)):
+        return instance.user_id
+    if isinstance(instance, (BaseBudget, LivingBudget)):
+        return Budget.objects.filter(pk=instance.budget_id).values_list("user_id", flat=True).first()
+    if isinstance(instance, BaseBudgetItem):
+        return (
+            Budget.objects.filter(base_budget__id=instance.base_budget_id)
+            .values_list("user_id", flat=True).first()
+        )
+    if isinstance(instance, LivingBudgetItem):
+        return (
+            Budget.objects.filter(living_budget__id=instance.living_budget_id)
+            .values_list("user_id", flat=True).first()
+        )
+    return None
+
+
+# 데이터 버전 행은 가입 때 한 번 만들어 둠 -> ETag 조회는 SELECT만, bump는 UPDATE 한 번
+@receiver(post_save, sender=User)
+def create_data_version(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        DataVersion.objects.get_or_create(pk=instance.pk)
+
+
+@receiver(post_save, sender=LedgerEntry)
+@receiver(post_save, sender=Budget)
+@receiver(post_save, sender=BaseBudget)
+@receiver(post_save, sender=BaseBudgetItem)
+@receiver(post_save, sender=LivingBudget)
+@receiver(post_save, sender=LivingBudgetItem)
+@receiver(post_save, sender=ExchangeProfile)
+def bump_on_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= DERIVED_FIELDS:
+        return
+    bump_data_version(_owner_id(instance), sender=sender)
+
+
+@receiver(post_delete, sender=LedgerEntry)
+@receiver(post_delete, sender=Budget)
+@receiver(post_delete, sender=BaseBudget)
+@receiver(post_delete, sender=BaseBudgetItem)
+@receiver(post_delete, sender=LivingBudget)
+@receiver(post_delete, sender=LivingBudgetItem)
+@receiver(post_delete, sender=ExchangeProfile)
+def bump_on_delete(sender, instance, **kwargs):
+    bump_data_version(_owner_id(instance), sender=sender)
@@ -1,3 +1,29 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from .models import DataVersion, User
+from .versioning import bump_data_version, data_etag
+
+
+# 데이터 버전: 행은 가입 때 생성, ETag 조회는 SELECT만
+class DataVersionTests(TestCase):
+    def test_row_is_created_at_signup(self):
+        user = User.objects.create(username="version", nickname="version")
+        self.assertEqual(DataVersion.objects.get(pk=user.pk).version, 0)
+
+    def test_etag_read_does_not_write(self):
+        user = User.objects.create(username="version", nickname="version")
+        DataVersion.objects.filter(pk=user.pk).delete()
+
+        with CaptureQueriesContext(connection) as captured:
+            etag = data_etag(user)
+        self.assertTrue(all(query["sql"].lstrip().upper().startswith("SELECT") for query in captured.captured_queries))
+        self.assertTrue(etag.startswith(f'"{user.pk}-0-'))
+        self.assertFalse(DataVersion.objects.filter(pk=user.pk).exists())
+
+    def test_bump_changes_etag(self):
+        user = User.objects.create(username="version", nickname="version")
+        before = data_etag(user)
+        bump_data_version(user.pk)
+        self.assertNotEqual(before, data_etag(user))
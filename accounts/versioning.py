@@ -0,0 +1,56 @@
+from datetime import date
+from functools import wraps
+
+from django.dispatch import Signal
+from rest_framework.response import Response
+
+from rates.models import RateGeneration
+from .models import DataVersion
+
+"""
+    # 사용자별 데이터 버전 + ETag
+    - 가계부/예산안/교환 프로필 저장·삭제 시 bump_data_version(user_id) (accounts/signals.py)
+    - 버전이 올라가면 data_changed 시그널 발송 (다른 앱의 캐시/요약 갱신용)
+    - ETag = 사용자 id + 데이터 버전 + 환율 세대 + 오늘 날짜 (이번 달 등 날짜 기준 응답 때문)
+    - If-None-Match가 같으면 집계/직렬화 전에 304 반환
+"""
+
+# sender: 변경된 모델 클래스, user_id: 버전이 올라간 사용자
+data_changed = Signal()
+
+
+def bump_data_version(user_id, sender=None):
+    if user_id is None:
+        return
+    DataVersion.bump(user_id)
+    data_changed.send(sender=sender, user_id=user_id)
+
+
+def data_etag(user):
+    return f'"{user.pk}-{DataVersion.current(user.pk)}-{RateGeneration.current()}-{date.today():%Y%m%d}"'
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in header.split(","))
+
+
+# APIView의 get에 붙이는 데코레이터 (200 응답에만 ETag 헤더 추가)
+def etag_by_data_version(view_method):
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        etag = data_etag(request.user)
+        if _etag_matches(request.headers.get("If-None-Match"), etag):
+            response = Response(status=304)
+            response["ETag"] = etag
+            return response
+
+        response = view_method(self, request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = etag
+        return response
+
+    return wrapper
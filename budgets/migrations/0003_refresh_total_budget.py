@@ -0,0 +1,35 @@
+from decimal import Decimal
+import re
+
+from django.db import migrations
+
+
+# 지금까지는 조회할 때마다 총액을 다시 저장했으므로, 조회 없이 바뀐 값(파견 기간 등)을 한 번 맞춰 둠
+def refresh_total_budget(apps, schema_editor):
+    Budget = apps.get_model("budgets", "Budget")
+    ExchangeProfile = apps.get_model("accounts", "ExchangeProfile")
+    periods = dict(ExchangeProfile.objects.values_list("user_id", "exchange_period"))
+    for budget in Budget.objects.select_related("base_budget", "living_budget").iterator(chunk_size=500):
+        total = Decimal(0)
+        base_budget = getattr(budget, "base_budget", None)
+        if base_budget is not None:
+            total += base_budget.total_amount_krw or Decimal(0)
+        living_budget = getattr(budget, "living_budget", None)
+        if living_budget is not None:
+            match = re.search(r"\d+", periods.get(budget.user_id) or "")
+            months = int(match.group()) if match else 0
+            total += Decimal(living_budget.total_amount or 0) * months
+        if total != budget.total_budget:
+            Budget.objects.filter(pk=budget.pk).update(total_budget=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_dataversion'),
+        ('budgets', '0002_budget_total_budget'),
+    ]
+
+    operations = [
+        migrations.RunPython(refresh_total_budget, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,18 @@
 from django.db import models
 from django.conf import settings
-from rates.utils import convert_to_krw
+from rates.utils import convert_to_krw, convert_many_to_krw
 from accounts.models import ExchangeProfile
 from decimal import Decimal
 import re
 
 # Create your models here.
 
+#파견 기간 문자열("6개월" 등)에서 개월 수 추출 (없으면 0)
+def exchange_months(exchange_period):
+    match = re.search(r"\d+", exchange_period or "")
+    return int(match.group()) if match else 0
+
+
 #통화 옵션
 class CurrencyOption(models.TextChoices):
     KRW = "KRW", "대한민국 원 (KRW)"
@@ -25,11 +31,15 @@ class BaseBudget(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    #기본 파견비 합산 함수(한화 기준) 
-    def update_total(self):
-        total = sum(item.get_krw_amount() for item in self.items.all())
+    #기본 파견비 합산 함수(한화 기준) -> 예산안 총액은 post_save 시그널에서 다시 계산
+    #items: 이미 메모리에 있는 전체 항목 (없으면 DB에서 다시 읽음)
+    #update_fields: 환율 변경처럼 총액만 다시 계산할 때 지정 (사용자 데이터 버전은 올리지 않음)
+    def update_total(self, items=None, update_fields=None):
+        if items is None:
+            items = self.items.all()
+        total = sum(item.get_krw_amount() or Decimal(0) for item in items)
         self.total_amount_krw = total
-        self.save()
+        self.save(update_fields=update_fields)
         return total #한화 총액 반환
 
 
@@ -60,6 +70,17 @@ class BaseBudgetItem(models.Model):
 
         super().save(*args, **kwargs)
 
+    #여러 항목의 한화 환산액을 한 환율 스냅샷으로 채움 (bulk_create/bulk_update는 save()를 거치지 않으므로)
+    @staticmethod
+    def fill_exchange_amounts(items):
+        foreign = [item for item in items if item.currency != "KRW"]
+        converted = convert_many_to_krw((item.amount, item.currency) for item in foreign).items
+        for item, exchange_amount in zip(foreign, converted):
+            item.exchange_amount = exchange_amount
+        for item in items:
+            if item.currency == "KRW":
+                item.exchange_amount = item.amount
+
     #한화 변환 함수(rates.util에서 가져옴)
     def get_amount_in_krw(self):
         return convert_to_krw(self.amount, self.currency)
@@ -121,9 +142,9 @@ class Budget(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def get_total_budget(self):
+    def compute_total_budget(self):
         """
-        총 예상 금액 산출:
+        총 예상 금액 산출 (저장하지 않음):
         (1) BaseBudget의 원화 총합
         (2) LivingBudget의 월별 총합 * 파견개월 수
         """
@@ -134,24 +155,19 @@ class Budget(models.Model):
             total += self.base_budget.total_amount_krw or Decimal(0)
 
         #한 달 생활비 * 파견 개월 수 
-        months = 0
         exchange_profile = getattr(self.user, "exchange_profile", None)
-        if exchange_profile:
-            duration = getattr(exchange_profile, "exchange_period", "")
-            #string값에서 숫자 추출
-            match = re.search(r"\d+", duration)
-            if match:
-                months = int(match.group())
-            else:
-                months = 0
+        months = exchange_months(getattr(exchange_profile, "exchange_period", ""))
         if hasattr(self, "living_budget"):
             monthly_total = self.living_budget.total_amount or Decimal(0)
             total += monthly_total*Decimal(months)
+        return total
 
-
-        #총합 저장
-        self.total_budget = total
-        self.save(update_fields=["total_budget"])
+    def get_total_budget(self):
+        """총 예상 금액을 다시 계산해서 값이 바뀐 경우에만 저장 (입력값이 바뀔 때 시그널에서 호출)"""
+        total = self.compute_total_budget()
+        if total != self.total_budget:
+            self.total_budget = total
+            self.save(update_fields=["total_budget"])
         return total
     
       
\ No newline at end of file
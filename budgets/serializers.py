@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from django.db import transaction
+from django.utils import timezone
 from .models import *
 
 
@@ -39,35 +41,55 @@ class BaseBudgetSerializer(serializers.ModelSerializer):
 
         return value
 
+    @transaction.atomic
     def create(self, validated_data):
         items_data = validated_data.pop("items", [])
         base_budget = BaseBudget.objects.create(**validated_data)
 
-        for item_data in items_data:
-            BaseBudgetItem.objects.create(base_budget=base_budget, **item_data)
+        items = [BaseBudgetItem(base_budget=base_budget, **item_data) for item_data in items_data]
+        BaseBudgetItem.fill_exchange_amounts(items)
+        BaseBudgetItem.objects.bulk_create(items)
 
-        base_budget.update_total()
+        base_budget.update_total(items)
         return base_budget
     
+    # 기존 항목을 한 번만 읽어서 메모리에서 비교 -> 새 항목은 bulk_create, 바뀐 항목은 bulk_update
+    @transaction.atomic
     def update(self, instance, validated_data):
         items_data = validated_data.pop("items", [])
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
 
+        items = list(instance.items.order_by("pk"))
+        by_type = {}
+        for item in items:
+            by_type.setdefault(item.type, item)
+
+        changed, created = [], []
         for item_data in items_data:
-            item_type = item_data.get("type")
-            item_obj = instance.items.filter(type=item_type).first()
+            item_obj = by_type.get(item_data.get("type"))
 
             if item_obj:
                 for attr, value in item_data.items():
                     setattr(item_obj, attr, value)
-                item_obj.save()
+                if item_obj.pk is not None and item_obj not in changed:
+                    changed.append(item_obj)
             else:
-                BaseBudgetItem.objects.create(base_budget=instance, **item_data)
-
-        instance.update_total()
+                item_obj = BaseBudgetItem(base_budget=instance, **item_data)
+                by_type[item_obj.type] = item_obj
+                created.append(item_obj)
+                items.append(item_obj)
+
+        BaseBudgetItem.fill_exchange_amounts(changed + created)
+        now = timezone.now()
+        for item_obj in changed:
+            item_obj.updated_at = now
+        BaseBudgetItem.objects.bulk_update(changed, ["type", "amount", "currency", "exchange_amount", "updated_at"])
+        BaseBudgetItem.objects.bulk_create(created)
+
+        # 총액 계산과 함께 instance 저장
+        instance.update_total(items)
         return instance
 
 
@@ -125,6 +147,8 @@ class LivingBudgetSerializer(serializers.ModelSerializer):
         return budget
 
         
+    # 기존 항목을 한 번만 읽어서 메모리에서 비교 -> 새 항목은 bulk_create, 바뀐 항목은 bulk_update
+    @transaction.atomic
     def update(self, instance, validated_data):
         items_data = validated_data.pop("items", [])
 
@@ -132,6 +156,11 @@ class LivingBudgetSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
 
+        by_key = {}
+        for item in instance.items.order_by("pk"):
+            by_key.setdefault((item.type, item.custom_name), item)
+
+        changed, created = [], []
         for item_data in items_data:
             item_type = item_data.get("type")
             custom_name = item_data.get("custom_name")
@@ -140,22 +169,30 @@ class LivingBudgetSerializer(serializers.ModelSerializer):
             if custom_name:
                 item_type = "ETC"
 
-            # 기존 항목 조회
-            item_obj = instance.items.filter(type=item_type, custom_name=custom_name).first()
+            item_obj = by_key.get((item_type, custom_name))
 
             if item_obj:
                 # 기존 항목 수정
                 for attr, value in item_data.items():
                     setattr(item_obj, attr, value)
-                item_obj.save()
+                if item_obj.pk is not None and item_obj not in changed:
+                    changed.append(item_obj)
             else:
                 # 새 항목 생성 (amount 포함 후에 저장)
-                LivingBudgetItem.objects.create(
+                item_obj = LivingBudgetItem(
                     living_budget=instance,
                     type=item_type,
                     custom_name=custom_name,
                     amount=item_data.get("amount", 0)
                 )
+                by_key[(item_type, custom_name)] = item_obj
+                created.append(item_obj)
+
+        now = timezone.now()
+        for item_obj in changed:
+            item_obj.updated_at = now
+        LivingBudgetItem.objects.bulk_update(changed, ["type", "custom_name", "amount", "updated_at"])
+        LivingBudgetItem.objects.bulk_create(created)
 
         return instance
 
@@ -171,9 +208,8 @@ class BudgetSerializer(serializers.ModelSerializer):
         model = Budget
         fields = ["id", "user", "total_budget_value", "base_budget", "living_budget", "created_at", "updated_at"]
     
+    # 총액은 입력값이 바뀔 때 budgets/signals.py에서 갱신 -> 조회 시에는 저장된 값만 읽음
     def get_total_budget_value(self, obj):
-        total = obj.get_total_budget()
-        obj.refresh_from_db(fields=["total_budget"])
         return obj.total_budget
     
     def create(self, validated_data):
@@ -0,0 +1,53 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from accounts.models import ExchangeProfile
+from rates.signals import rates_updated
+from .models import BaseBudget, Budget, LivingBudget
+
+"""
+    # 예산안 총액(total_budget) 갱신
+    - 조회(GET)에서는 저장된 값만 읽고, 입력값이 바뀔 때만 여기서 다시 계산
+    - 입력값: 기본 파견비 원화 총합, 한 달 생활비, 교환 프로필의 파견 기간, 환율(외화 기본 파견비)
+"""
+
+
+def _refresh_total_budget(**filters):
+    budgets = Budget.objects.select_related("base_budget", "living_budget", "user__exchange_profile").filter(**filters)
+    for budget in budgets:
+        budget.get_total_budget()
+
+
+@receiver(post_save, sender=BaseBudget)
+def refresh_on_base_budget(sender, instance, update_fields=None, **kwargs):
+    if update_fields and "total_amount_krw" not in update_fields:
+        return
+    _refresh_total_budget(pk=instance.budget_id)
+
+
+@receiver(post_save, sender=LivingBudget)
+def refresh_on_living_budget(sender, instance, update_fields=None, **kwargs):
+    if update_fields and "total_amount" not in update_fields:
+        return
+    _refresh_total_budget(pk=instance.budget_id)
+
+
+@receiver(post_save, sender=ExchangeProfile)
+def refresh_on_exchange_profile(sender, instance, update_fields=None, **kwargs):
+    if update_fields and "exchange_period" not in update_fields:
+        return
+    _refresh_total_budget(user_id=instance.user_id)
+
+
+# 바뀐 통화로 입력된 기본 파견비만 원화 총합 재계산 -> BaseBudget post_save에서 예산안 총액 갱신
+# 총액 필드만 저장해서 사용자 데이터 버전은 그대로 (환율 변경은 ETag의 환율 세대로 반영)
+@receiver(rates_updated)
+def refresh_on_rates(sender, currencies=(), **kwargs):
+    base_budgets = (
+        BaseBudget.objects
+        .filter(items__currency__in=currencies)
+        .distinct()
+        .prefetch_related("items")
+    )
+    for base_budget in base_budgets:
+        base_budget.update_total(update_fields=["total_amount_krw", "updated_at"])
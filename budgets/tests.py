@@ -1,3 +1,38 @@
+from decimal import Decimal
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import ExchangeProfile, User
+
+
+# 등록/수정 응답의 총 예상 금액이 하위 예산 저장 후 다시 계산한 값인지 확인
+class BudgetTotalResponseTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="budget", nickname="budget")
+        ExchangeProfile.objects.create(user=self.user, exchange_period="5개월")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_put_returns_recomputed_total_budget(self):
+        response = self.client.post("/budgets/fill/", {
+            "base_budget": {"items": [
+                {"type": "FLIGHT", "amount": "1000000", "currency": "KRW"},
+                {"type": "INSURANCE", "amount": "300000", "currency": "KRW"},
+                {"type": "VISA", "amount": "100000", "currency": "KRW"},
+                {"type": "TUITION", "amount": "2000000", "currency": "KRW"},
+            ]},
+            "living_budget": {"total_amount": 1500000, "items": [{"type": "FOOD", "amount": "400000"}]},
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+        # 3,400,000 + 1,500,000 x 5개월
+        self.assertEqual(Decimal(response.data["total_budget_value"]), Decimal("10900000"))
 
-# Create your tests here.
+        response = self.client.put("/budgets/fill/", {"living_budget": {"total_amount": 1000000}}, format="json")
+        self.assertEqual(response.status_code, 200)
+        # 3,400,000 + 1,000,000 x 5개월
+        self.assertEqual(Decimal(response.data["total_budget_value"]), Decimal("8400000"))
+        self.assertEqual(
+            Decimal(self.client.get("/budgets/fill/").data["total_budget_value"]),
+            Decimal(response.data["total_budget_value"]),
+        )
@@ -6,6 +6,7 @@ from .models import *
 from .serializers import *
 from django.conf import settings
 from rest_framework import status
+from accounts.versioning import etag_by_data_version
 
 # Create your views here.
 """
@@ -21,15 +22,27 @@ from rest_framework import status
 class BudgetView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    #조회
+    #조회 (예산안이 처음 만들어질 때 한 번만 쓰기, 이후에는 읽기만)
+    @etag_by_data_version
     def get(self, request):
-        budget, _ = Budget.objects.get_or_create(user=request.user)
-
-        BaseBudget.objects.get_or_create(budget=budget)
-        LivingBudget.objects.get_or_create(budget=budget)
+        budget = self._load(request.user)
+        if budget is None or not hasattr(budget, "base_budget") or not hasattr(budget, "living_budget"):
+            budget, _ = Budget.objects.get_or_create(user=request.user)
+            BaseBudget.objects.get_or_create(budget=budget)
+            LivingBudget.objects.get_or_create(budget=budget)
+            budget = self._load(request.user)
 
         serilizer = BudgetSerializer(budget)
         return Response(serilizer.data)
+
+    def _load(self, user):
+        return (
+            Budget.objects
+            .select_related("base_budget", "living_budget")
+            .prefetch_related("base_budget__items", "living_budget__items")
+            .filter(user=user)
+            .first()
+        )
     
     #등록
     def post(self, request):
@@ -72,7 +85,8 @@ class BudgetView(APIView):
                 return Response(living_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
             
 
-        # Budget 전체 직렬화
+        # Budget 전체 직렬화 (하위 저장 때 signals에서 다시 계산한 total_budget을 읽도록 새로 불러옴)
+        budget = self._load(request.user)
         serializer = BudgetSerializer(budget)
         return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
     
@@ -1,6 +1,9 @@
 #!/bin/sh
 # python manage.py collectstatic --no-input echo "Apply database migrations" python manage.py migrate
+# web 컨테이너 전용 (worker 컨테이너는 이 스크립트 없이 run_worker만 실행해서 migrate가 동시에 돌지 않게 함)
 python manage.py collectstatic --no-input
 python manage.py makemigrations
 python manage.py migrate
+# 카드가 없는 작성자만 채움 (없으면 바로 끝남)
+python manage.py backfill_feed_cards
 exec "$@"
\ No newline at end of file
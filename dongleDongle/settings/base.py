@@ -60,6 +60,7 @@ INSTALLED_APPS = [
     'budgets',
     'feeds',
     'summaries',
+    'jobs',
 ]
 
 SITE_ID = 1
@@ -113,6 +114,13 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'if-none-match',
+    'idempotency-key',
+]
+# 클라이언트가 ETag를 읽어 If-None-Match로 다시 보낼 수 있도록 (+ 재시도 응답 여부)
+CORS_EXPOSE_HEADERS = [
+    'etag',
+    'idempotent-replayed',
 ]
 
 ROOT_URLCONF = 'dongleDongle.urls'
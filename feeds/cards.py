@@ -0,0 +1,218 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.contrib.auth import get_user_model
+
+from budgets.models import Budget
+from jobs.queue import enqueue
+from ledgers.aggregates import convert_groups, monthly_groups
+from rates.money import Money
+from rates.utils import convert_from_krw
+from summaries.models import SummarySnapshot
+from .models import FeedCard
+
+"""
+    # 피드 카드(FeedCard) 갱신
+    - 작성자의 가계부/예산안/교환 프로필이 바뀌면(data_changed) 카드 갱신 작업 등록 -> 워커에서 다시 계산
+    - 환율이 바뀌면(rates_updated) 전체 카드 갱신 작업 1개 등록
+    - 같은 작업이 이미 대기 중이면 다시 등록하지 않음 (Job.dedupe_key unique 제약)
+    - 목록 조회는 저장된 카드만 읽음 (쓰기/계산 없음), 카드가 없는 작성자(카드 도입 전 스냅샷)는
+      manage.py backfill_feed_cards 로 채움 -> 그 전까지는 금액 없이(None) 응답
+"""
+
+REFRESH_TASK = "feeds.cards.refresh_feed_card"
+REFRESH_ALL_TASK = "feeds.cards.refresh_all_feed_cards"
+
+COUNTRY_TO_CURRENCY = {
+    "한국": "KRW",
+    "미국": "USD",
+    "일본": "JPY",
+    "독일": "EUR",
+    "프랑스": "EUR",
+    "중국": "CNY",
+    "대만": "TWD",
+    "캐나다": "CAD",
+    "이탈리아": "EUR",
+    "네덜란드": "EUR",
+    "영국": "GBP",
+}
+
+
+# 그룹별 합계의 현재 환율 기준 원화 합 (환율 없는 통화는 제외)
+def sum_current_krw(groups):
+    total = Money.zero("KRW")
+    for group in groups:
+        if group["current_krw"] is not None:
+            total += Money.from_decimal(group["current_krw"], "KRW")
+    return total.to_decimal()
+
+
+# 총 파견비용 합산 -> 가계부 등록 총합 + 기본파견비용
+def get_total_expense_with_budget(user):
+    living_categories = ["FOOD", "HOUSING", "TRANSPORT", "SHOPPING", "TRAVEL", "STUDY_MATERIALS"]
+
+    exchange_profile = getattr(user, "exchange_profile", None)
+    if not exchange_profile:
+        return Decimal("0"), Decimal("0")
+
+    exchange_country = exchange_profile.exchange_country
+    target_currency = COUNTRY_TO_CURRENCY.get(exchange_country, "KRW")
+
+    # LedgerEntry 지출 합산 (원화 기준, 월별 합계 테이블에서 전체 기간)
+    total_krw = sum_current_krw(convert_groups(monthly_groups(user, entry_type="EXPENSE", categories=living_categories)))
+
+    # 예산안 기본파견비용 추가
+    budget = Budget.objects.filter(user=user).first()
+    if budget and hasattr(budget, "base_budget"):
+        base_budget = budget.base_budget
+        if base_budget.items.exists():
+            for item in base_budget.items.all():
+                total_krw += item.get_krw_amount()
+
+    # 교환국 화폐 기준으로 변환
+    total_foreign = convert_from_krw(total_krw, target_currency)
+    return total_foreign, total_krw
+
+
+# 가계부 등록합산만 (예산안 제외)
+def get_total_ledger_expense(user):
+    living_categories = ["FOOD", "HOUSING", "TRANSPORT", "SHOPPING", "TRAVEL", "STUDY_MATERIALS"]
+
+    exchange_profile = getattr(user, "exchange_profile", None)
+    if not exchange_profile:
+        return Decimal("0"), Decimal("0")
+
+    exchange_country = exchange_profile.exchange_country
+    target_currency = COUNTRY_TO_CURRENCY.get(exchange_country, "KRW")
+
+    # LedgerEntry 지출 합산 (원화 기준, 월별 합계 테이블에서 전체 기간)
+    total_krw = sum_current_krw(convert_groups(monthly_groups(user, entry_type="EXPENSE", categories=living_categories)))
+
+    total_foreign = convert_from_krw(total_krw, target_currency)
+    return total_foreign, total_krw
+
+
+def safe_divide(amount: Decimal, months: int) -> Decimal:
+    if not months or months == 0:
+        return Decimal("0")
+    return (amount / Decimal(months)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def _compute_feed_card(user):
+    """작성자 카드 값 계산 (저장하지 않음)"""
+    exchange_profile = getattr(user, "exchange_profile", None)
+    foreign_currency = COUNTRY_TO_CURRENCY.get(getattr(exchange_profile, "exchange_country", None), "KRW")
+
+    dispatch_foreign, dispatch_krw = get_total_expense_with_budget(user)
+    ledger_foreign, ledger_krw = get_total_ledger_expense(user)
+    return FeedCard(
+        user=user,
+        foreign_currency=foreign_currency,
+        dispatch_foreign_amount=dispatch_foreign,
+        dispatch_krw_amount=dispatch_krw,
+        ledger_foreign_amount=ledger_foreign,
+        ledger_krw_amount=ledger_krw,
+    )
+
+
+def refresh_feed_card(user_id):
+    user = get_user_model().objects.select_related("exchange_profile").filter(pk=user_id).first()
+    if user is None:
+        return None
+
+    computed = _compute_feed_card(user)
+    card, _ = FeedCard.objects.update_or_create(
+        user=user,
+        defaults={
+            field: getattr(computed, field)
+            for field in (
+                "foreign_currency",
+                "dispatch_foreign_amount",
+                "dispatch_krw_amount",
+                "ledger_foreign_amount",
+                "ledger_krw_amount",
+            )
+        },
+    )
+    return card
+
+
+def refresh_all_feed_cards(batch_size=200):
+    last_id = 0
+    while True:
+        user_ids = list(
+            FeedCard.objects.filter(user_id__gt=last_id)
+            .order_by("user_id")
+            .values_list("user_id", flat=True)[:batch_size]
+        )
+        if not user_ids:
+            return
+        for user_id in user_ids:
+            refresh_feed_card(user_id)
+        last_id = user_ids[-1]
+
+
+def _enqueue_once(task, payload):
+    key = ":".join([task, *(f"{name}={payload[name]}" for name in sorted(payload))])
+    enqueue(task, payload, dedupe_key=key)
+
+
+def schedule_refresh(user_id):
+    """카드가 있는 작성자만 갱신 작업 등록"""
+    if FeedCard.objects.filter(user_id=user_id).exists():
+        _enqueue_once(REFRESH_TASK, {"user_id": user_id})
+
+
+def schedule_refresh_all():
+    _enqueue_once(REFRESH_ALL_TASK, {})
+
+
+def get_feed_card(user):
+    """select_related("user__feed_card")로 읽은 카드, 없으면 None (조회에서는 계산/저장하지 않음)"""
+    try:
+        return user.feed_card
+    except FeedCard.DoesNotExist:
+        return None
+
+
+def backfill_feed_cards(batch_size=200):
+    """최신 스냅샷이 있는데 카드가 없는 작성자의 카드를 만듦, 만든 카드 수 반환"""
+    created = 0
+    last_id = 0
+    while True:
+        user_ids = list(
+            SummarySnapshot.objects
+            .filter(is_latest=True, user_id__gt=last_id, user__feed_card__isnull=True)
+            .order_by("user_id")
+            .values_list("user_id", flat=True)[:batch_size]
+        )
+        if not user_ids:
+            return created
+        for user_id in user_ids:
+            if refresh_feed_card(user_id) is not None:
+                created += 1
+        last_id = user_ids[-1]
+
+
+def _quantize(amount):
+    return str(amount.quantize(Decimal("0.01"))) if amount is not None else None
+
+
+def apply_feed_card(feed_data, card, months):
+    """목록 응답 한 건에 카드 금액 채움 (평균 생활비는 스냅샷의 파견 개월 수로 나눔)"""
+    if card is None:
+        for field in (
+            "base_dispatch_foreign_amount",
+            "base_dispatch_krw_amount",
+            "living_expense_foreign_amount",
+            "living_expense_krw_amount",
+        ):
+            feed_data[field] = None
+        return
+    feed_data["base_dispatch_foreign_amount"] = _quantize(card.dispatch_foreign_amount)
+    feed_data["base_dispatch_krw_amount"] = _quantize(card.dispatch_krw_amount)
+    feed_data["living_expense_foreign_amount"] = (
+        _quantize(safe_divide(card.ledger_foreign_amount, months))
+        if card.ledger_foreign_amount is not None
+        else None
+    )
+    feed_data["living_expense_krw_amount"] = _quantize(safe_divide(card.ledger_krw_amount, months))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from feeds.cards import backfill_feed_cards
+
+
+class Command(BaseCommand):
+    help = "최신 스냅샷은 있는데 FeedCard가 없는 작성자의 카드를 만듭니다. (목록 조회는 저장된 카드만 읽음)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200, help="한 번에 처리하는 작성자 수")
+
+    def handle(self, *args, **options):
+        created = backfill_feed_cards(batch_size=options["batch_size"])
+        self.stdout.write(f"피드 카드 채우기 완료 ({created}개 생성)")
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from feeds.models import FeedFavorite, FeedScrap
+from summaries.models import SummarySnapshot
+
+
+def _counts(model, ids):
+    return dict(
+        model.objects.filter(snapshot_id__in=ids)
+        .values("snapshot_id")
+        .annotate(count=Count("id"))
+        .values_list("snapshot_id", "count")
+    )
+
+
+class Command(BaseCommand):
+    help = "SummarySnapshot의 like_count/scrap_count를 FeedFavorite/FeedScrap 행 수로 다시 맞춥니다. (탈퇴 등 CASCADE 삭제 후 보정)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="한 번에 확인하는 스냅샷 수")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        fixed = 0
+        last_id = 0
+        while True:
+            snapshots = list(
+                SummarySnapshot.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .only("id", "like_count", "scrap_count")[:batch_size]
+            )
+            if not snapshots:
+                break
+            ids = [snapshot.id for snapshot in snapshots]
+            likes = _counts(FeedFavorite, ids)
+            scraps = _counts(FeedScrap, ids)
+
+            changed = []
+            for snapshot in snapshots:
+                like_count, scrap_count = likes.get(snapshot.id, 0), scraps.get(snapshot.id, 0)
+                if (snapshot.like_count, snapshot.scrap_count) != (like_count, scrap_count):
+                    snapshot.like_count, snapshot.scrap_count = like_count, scrap_count
+                    changed.append(snapshot)
+            SummarySnapshot.objects.bulk_update(changed, ["like_count", "scrap_count"])
+            fixed += len(changed)
+            last_id = ids[-1]
+
+        self.stdout.write(f"좋아요/스크랩 수 보정 완료 ({fixed}행 수정)")
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_dataversion'),
+        ('feeds', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedCard',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_card', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('foreign_currency', models.CharField(default='KRW', max_length=5)),
+                ('dispatch_foreign_amount', models.DecimalField(decimal_places=6, max_digits=26, null=True)),
+                ('dispatch_krw_amount', models.DecimalField(decimal_places=6, default=0, max_digits=26)),
+                ('ledger_foreign_amount', models.DecimalField(decimal_places=6, max_digits=26, null=True)),
+                ('ledger_krw_amount', models.DecimalField(decimal_places=6, default=0, max_digits=26)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
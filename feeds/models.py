@@ -23,3 +23,20 @@ class FeedFavorite(models.Model):
 
     def __str__(self):
         return f"{self.user} → 좋아요 {self.snapshot.id}"
+
+
+# 피드 카드 금액 (작성자별 1행)
+# 목록 API에서 작성자마다 가계부/예산안을 다시 계산하지 않도록 미리 저장, 작성자의 쓰기/환율 변경 시 갱신 (feeds/cards.py)
+class FeedCard(models.Model):
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="feed_card")
+    foreign_currency = models.CharField(max_length=5, default="KRW")
+    # 총 파견비용 = 가계부 지출 + 기본 파견비 (현재 환율 기준)
+    dispatch_foreign_amount = models.DecimalField(max_digits=26, decimal_places=6, null=True)
+    dispatch_krw_amount = models.DecimalField(max_digits=26, decimal_places=6, default=0)
+    # 가계부 지출 총합 -> 스냅샷의 파견 개월 수로 나눠서 한 달 평균 생활비
+    ledger_foreign_amount = models.DecimalField(max_digits=26, decimal_places=6, null=True)
+    ledger_krw_amount = models.DecimalField(max_digits=26, decimal_places=6, default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} 피드 카드"
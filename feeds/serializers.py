@@ -12,9 +12,6 @@ class FeedListSerializer(serializers.ModelSerializer):
     exchange_semester = serializers.CharField(source="snapshot_exchange_semester")
     exchange_period = serializers.CharField(source="snapshot_exchange_period")
 
-    like_count = serializers.SerializerMethodField()
-    scrap_count = serializers.SerializerMethodField()
-
     class Meta:
         model = SummarySnapshot
         fields = [
@@ -36,12 +33,6 @@ class FeedListSerializer(serializers.ModelSerializer):
             "created_at",
         ]
 
-    def get_like_count(self, obj):
-        return obj.favorited_by.count()
-
-    def get_scrap_count(self, obj):
-        return obj.scrapped_by.count()
-
 
 class FeedDetailSerializer(serializers.ModelSerializer):
     user_info = serializers.SerializerMethodField()
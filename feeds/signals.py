@@ -0,0 +1,17 @@
+from django.dispatch import receiver
+
+from accounts.versioning import data_changed
+from rates.signals import rates_updated
+from .cards import schedule_refresh, schedule_refresh_all
+
+
+# 작성자의 가계부/예산안/교환 프로필 변경 -> 해당 카드만 갱신
+@receiver(data_changed)
+def refresh_card_on_data_changed(sender, user_id, **kwargs):
+    schedule_refresh(user_id)
+
+
+# 환율 변경 -> 현재 환율 기준 금액이라 전체 카드 갱신
+@receiver(rates_updated)
+def refresh_cards_on_rates(sender, **kwargs):
+    schedule_refresh_all()
@@ -1,3 +1,109 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import ExchangeProfile, User
+from jobs.models import Job
+from summaries.models import SummarySnapshot
+
+from .cards import REFRESH_TASK, backfill_feed_cards, schedule_refresh
+from .models import FeedCard
+
+
+class FeedTestMixin:
+    def setUp(self):
+        self.author = User.objects.create(username="author", nickname="author")
+        ExchangeProfile.objects.create(user=self.author, exchange_country="한국", exchange_period="5개월")
+        self.snapshot = SummarySnapshot.objects.create(
+            user=self.author, is_latest=True, snapshot_exchange_period="5개월",
+        )
+        self.client = APIClient()
+
+
+# 피드 목록은 저장된 카드만 읽고, 카드가 없는 작성자는 backfill_feed_cards 로 채움
+class FeedCardReadTests(FeedTestMixin, TestCase):
+    def test_list_without_card_does_not_write(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get("/feeds/")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([
+            query["sql"] for query in captured.captured_queries
+            if not query["sql"].lstrip().upper().startswith("SELECT")
+        ])
+        self.assertIsNone(response.data["data"][0]["base_dispatch_krw_amount"])
+        self.assertFalse(Job.objects.exists())
+
+    def test_backfill_creates_missing_cards_once(self):
+        self.assertEqual(backfill_feed_cards(), 1)
+        self.assertEqual(backfill_feed_cards(), 0)
+        self.assertTrue(FeedCard.objects.filter(user=self.author).exists())
+
+        response = self.client.get("/feeds/")
+        self.assertEqual(response.data["data"][0]["base_dispatch_krw_amount"], "0.00")
+
+    def test_refresh_is_enqueued_once_while_pending(self):
+        backfill_feed_cards()
+        schedule_refresh(self.author.id)
+        schedule_refresh(self.author.id)
+        self.assertEqual(Job.objects.filter(task=REFRESH_TASK, status=Job.Status.PENDING).count(), 1)
+
+
+# 좋아요/스크랩 수: 누를 때마다 정확히 1씩, 0 아래로 내려가지 않고, 행 수와 같아야 함
+class FeedCounterTests(FeedTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.readers = [User.objects.create(username=f"reader{index}", nickname=f"reader{index}") for index in range(3)]
+
+    def _as(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def _counts(self):
+        self.snapshot.refresh_from_db()
+        return self.snapshot.like_count, self.snapshot.scrap_count
+
+    def test_toggle_changes_counter_by_one(self):
+        client = self._as(self.readers[0])
+        for path, index in [("favorites", 0), ("scrap", 1)]:
+            url = f"/feeds/{self.snapshot.id}/{path}/"
+
+            self.assertEqual(client.post(url).status_code, 201)
+            self.assertEqual(self._counts()[index], 1)
+            self.assertEqual(client.post(url).status_code, 400)
+            self.assertEqual(self._counts()[index], 1)
+
+            self.assertEqual(client.delete(url).status_code, 204)
+            self.assertEqual(self._counts()[index], 0)
+            self.assertEqual(client.delete(url).status_code, 404)
+            self.assertEqual(self._counts()[index], 0)
+
+    def test_counter_never_goes_below_zero(self):
+        client = self._as(self.readers[0])
+        client.post(f"/feeds/{self.snapshot.id}/favorites/")
+        client.post(f"/feeds/{self.snapshot.id}/scrap/")
+        # 카운터가 행 수와 어긋난 상태에서 취소해도 음수가 되지 않음
+        SummarySnapshot.objects.filter(pk=self.snapshot.pk).update(like_count=0, scrap_count=0)
+
+        client.delete(f"/feeds/{self.snapshot.id}/favorites/")
+        client.delete(f"/feeds/{self.snapshot.id}/scrap/")
+        self.assertEqual(self._counts(), (0, 0))
+
+    def test_counter_matches_rows(self):
+        for reader in self.readers:
+            self._as(reader).post(f"/feeds/{self.snapshot.id}/favorites/")
+            self._as(reader).post(f"/feeds/{self.snapshot.id}/scrap/")
+        self._as(self.readers[0]).delete(f"/feeds/{self.snapshot.id}/favorites/")
+
+        self.assertEqual(self._counts(), (self.snapshot.favorited_by.count(), self.snapshot.scrapped_by.count()))
+        self.assertEqual(self._counts(), (2, 3))
 
-# Create your tests here.
+        # CASCADE 삭제로 어긋난 카운터는 reconcile_feed_counters 로 다시 맞춤
+        self.readers[1].delete()
+        call_command("reconcile_feed_counters", stdout=StringIO())
+        self.assertEqual(self._counts(), (self.snapshot.favorited_by.count(), self.snapshot.scrapped_by.count()))
+        self.assertEqual(self._counts(), (1, 2))
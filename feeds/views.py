@@ -1,5 +1,6 @@
-from decimal import Decimal, ROUND_HALF_UP
-from django.db.models import Count, Max
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import F
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -8,80 +9,26 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 
 from django.db import models
 from .models import FeedFavorite, FeedScrap
+from .cards import (
+    COUNTRY_TO_CURRENCY,
+    apply_feed_card,
+    get_feed_card,
+    safe_divide,
+    sum_current_krw,
+)
 from .serializers import *
 from summaries.models import SummarySnapshot
 from ledgers.models import LedgerEntry
-from rates.views import convert_to_krw, convert_from_krw
-from budgets.models import BaseBudget, Budget, BaseBudgetItem
+from rates.views import convert_from_krw
+from rates.utils import convert_many_from_krw, convert_many_to_krw
+from ledgers.aggregates import convert_groups, monthly_groups
+from rates.money import Money
+from budgets.models import Budget, BaseBudgetItem
 import re
 
 
-COUNTRY_TO_CURRENCY = {
-    "한국": "KRW",
-    "미국": "USD",
-    "일본": "JPY",
-    "독일": "EUR",
-    "프랑스": "EUR",
-    "중국": "CNY",
-    "대만": "TWD",
-    "캐나다": "CAD",
-    "이탈리아": "EUR",
-    "네덜란드": "EUR",
-    "영국": "GBP",
-}
-
-
-# 총 파견비용 합산 -> 가계부 등록 총합 + 기본파견비용
-def get_total_expense_with_budget(user):
-    living_categories = ["FOOD", "HOUSING", "TRANSPORT", "SHOPPING", "TRAVEL", "STUDY_MATERIALS"]
-
-    exchange_profile = getattr(user, "exchange_profile", None)
-    if not exchange_profile:
-        return Decimal("0"), Decimal("0")
-
-    exchange_country = exchange_profile.exchange_country
-    target_currency = COUNTRY_TO_CURRENCY.get(exchange_country, "KRW")
-
-    # LedgerEntry 지출 합산 (원화 기준)
-    entries = LedgerEntry.objects.filter(user=user, entry_type="EXPENSE", category__in=living_categories)
-
-    total_krw = Decimal("0")
-    for entry in entries:
-        total_krw += convert_to_krw(entry.amount, entry.currency_code)
-
-    # 예산안 기본파견비용 추가
-    budget = Budget.objects.filter(user=user).first()
-    if budget and hasattr(budget, "base_budget"):
-        base_budget = budget.base_budget
-        if base_budget.items.exists():
-            for item in base_budget.items.all():
-                total_krw += item.get_krw_amount()
-
-    # 교환국 화폐 기준으로 변환
-    total_foreign = convert_from_krw(total_krw, target_currency)
-    return total_foreign, total_krw
-
-
-# 가계부 등록합산만 (예산안 제외)
-def get_total_ledger_expense(user):
-    living_categories = ["FOOD", "HOUSING", "TRANSPORT", "SHOPPING", "TRAVEL", "STUDY_MATERIALS"]
-
-    exchange_profile = getattr(user, "exchange_profile", None)
-    if not exchange_profile:
-        return Decimal("0"), Decimal("0")
-
-    exchange_country = exchange_profile.exchange_country
-    target_currency = COUNTRY_TO_CURRENCY.get(exchange_country, "KRW")
-
-    # LedgerEntry 지출 합산 (원화 기준)
-    entries = LedgerEntry.objects.filter(user=user, entry_type="EXPENSE", category__in=living_categories)
-
-    total_krw = Decimal("0")
-    for entry in entries:
-        total_krw += convert_to_krw(entry.amount, entry.currency_code)
-
-    total_foreign = convert_from_krw(total_krw, target_currency)
-    return total_foreign, total_krw
+# 상세 화면의 카테고리 표시 순서
+CATEGORY_ORDER = {code: index for index, code in enumerate(LedgerEntry.Category.values)}
 
 
 def get_months(exchange_period: str) -> int:
@@ -89,12 +36,6 @@ def get_months(exchange_period: str) -> int:
     return int(match.group(1)) if match else 1
 
 
-def safe_divide(amount: Decimal, months: int) -> Decimal:
-    if not months or months == 0:
-        return Decimal("0")
-    return (amount / Decimal(months)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-
 def ok(message, data=None, status=status.HTTP_200_OK):
     return Response({"message": message, "data": data}, status=status)
 
@@ -113,21 +54,11 @@ class FeedListView(APIView):
         univ = request.query_params.get("univ")
         exchange_type = request.query_params.get("exchange_type")
 
-        latest_ids = (
-            SummarySnapshot.objects
-            .values("user")
-            .annotate(latest_id=Max("id"))
-            .values_list("latest_id", flat=True)
-        )
-
+        # 사용자별 최신 스냅샷만 (스냅샷 저장 시 갱신되는 is_latest 인덱스 사용)
         feeds = (
             SummarySnapshot.objects
-            .filter(id__in=latest_ids)
-            .select_related("user", "exchange_profile")
-            .annotate(
-                like_count=Count("favorited_by"),
-                scrap_count=Count("scrapped_by"),
-            )
+            .filter(is_latest=True)
+            .select_related("user__feed_card", "exchange_profile")
         )
 
         if search:
@@ -143,6 +74,7 @@ class FeedListView(APIView):
         if exchange_type:
             feeds = feeds.filter(exchange_profile__exchange_type=exchange_type)
 
+        # 인기순은 (is_latest, scrap_count) 인덱스 사용
         if sort_option == "popular":
             feeds = feeds.order_by("-scrap_count")
         else:
@@ -152,21 +84,9 @@ class FeedListView(APIView):
         data = serializer.data
 
         for feed_data, snapshot in zip(data, feeds):
-            user = snapshot.user
+            # 총 파견비용(Ledger + BaseBudget), 평균 생활비(Ledger만)는 작성자별 FeedCard에 저장된 값 사용
             months = get_months(snapshot.snapshot_exchange_period)
-
-            # 총 파견비용 = Ledger + BaseBudget
-            total_foreign, total_krw = get_total_expense_with_budget(user)
-
-            # 평균 생활비 = Ledger만 (BaseBudget 제외)
-            ledger_foreign, ledger_krw = get_total_ledger_expense(user)
-            avg_foreign = safe_divide(ledger_foreign, months)
-            avg_krw = safe_divide(ledger_krw, months)
-
-            feed_data["base_dispatch_foreign_amount"] = str(total_foreign.quantize(Decimal("0.01")))
-            feed_data["base_dispatch_krw_amount"] = str(total_krw.quantize(Decimal("0.01")))
-            feed_data["living_expense_foreign_amount"] = str(avg_foreign.quantize(Decimal("0.01")))
-            feed_data["living_expense_krw_amount"] = str(avg_krw.quantize(Decimal("0.01")))
+            apply_feed_card(feed_data, get_feed_card(snapshot.user), months)
 
         return ok("가계부 요약본 목록 조회 성공", data)
 
@@ -180,8 +100,8 @@ class FeedDetailView(APIView):
             id=feed_id
         )
 
-        like_count = feed.favorited_by.count()
-        scrap_count = feed.scrapped_by.count()
+        like_count = feed.like_count
+        scrap_count = feed.scrap_count
         user_liked = False
         user_scrapped = False
 
@@ -204,27 +124,38 @@ class FeedDetailView(APIView):
         # 한달평균생활비 계산
         living_categories = ["FOOD", "HOUSING", "TRANSPORT", "SHOPPING", "TRAVEL", "STUDY_MATERIALS"]
 
-        ledger_foreign, ledger_krw = get_total_ledger_expense(user)
+        # LedgerEntry 지출합 (월별 합계에서 카테고리 x 통화별 전체 기간 합계를 가져와 그룹마다 환산)
+        # 현재 환율 기준 원화와 등록 당시 원화(쓰기 때 쌓아 둔 합계)를 함께 계산
+        groups = convert_groups(monthly_groups(user, entry_type="EXPENSE", categories=living_categories))
+
+        # 루프 안에서는 정수 Money로 합산
+        category_totals = {}
+        for group in groups:
+            if group["current_krw"] is None or group["entry_krw"] is None:
+                continue
+            totals = category_totals.setdefault(group["category"], [Money.zero("KRW"), Money.zero("KRW")])
+            totals[0] += Money.from_decimal(group["entry_krw"], "KRW")
+            totals[1] += Money.from_decimal(group["current_krw"], "KRW")
+
+        category_totals_krw = {code: totals[0].to_decimal() for code, totals in category_totals.items()}
+        category_current_krw = {code: totals[1].to_decimal() for code, totals in category_totals.items()}
+
+        # get_total_ledger_expense와 같은 값 (같은 항목을 다시 조회하지 않도록 여기서 계산)
+        ledger_krw = sum_current_krw(groups)
+        ledger_foreign = convert_from_krw(ledger_krw, target_currency)
         avg_foreign = safe_divide(ledger_foreign, months)
         avg_krw = safe_divide(ledger_krw, months)
 
-        # LedgerEntry 지출합
-        entries = LedgerEntry.objects.filter(user=user, entry_type="EXPENSE", category__in=living_categories)
-
-        category_totals_krw = {}
-        for entry in entries:
-            krw_amount = convert_to_krw(entry.amount, entry.currency_code)
-            category_totals_krw.setdefault(entry.category, Decimal("0"))
-            category_totals_krw[entry.category] += krw_amount
-
         living_expense_categories = []
         total_krw = Decimal("0")
 
-        for code, krw_amount in category_totals_krw.items():
+        # 카테고리는 LedgerEntry.Category 선언 순서로 표시
+        for code in sorted(category_totals_krw, key=CATEGORY_ORDER.get):
+            krw_amount = category_totals_krw[code]
             label = LedgerEntry.Category(code).label
             foreign_amount = convert_from_krw(krw_amount, target_currency)
 
-            current_krw_amount = convert_to_krw(foreign_amount, target_currency)
+            current_krw_amount = category_current_krw[code]
 
             living_expense_categories.append({
                 "code": code,
@@ -258,14 +189,17 @@ class FeedDetailView(APIView):
         }
 
         if base_budget:
-            total_krw = sum(item.get_krw_amount() for item in base_budget.items.all())
+            items = list(base_budget.items.all())
+            costs_krw = [item.get_krw_amount() for item in items]
+            total_krw = sum(costs_krw)
             categories = []
 
-            for item in base_budget.items.all():
+            # 항목별 외화/현재 환율 원화는 일괄 변환 (항목별 반올림은 단건 변환과 같음)
+            costs_foreign = convert_many_from_krw((cost_krw, target_currency) for cost_krw in costs_krw).items
+            currents_krw = convert_many_to_krw((cost_foreign, target_currency) for cost_foreign in costs_foreign).items
+
+            for item, cost_krw, cost_foreign, current_krw in zip(items, costs_krw, costs_foreign, currents_krw):
                 label = BaseBudgetItem.BaseItem(item.type).label
-                cost_krw = item.get_krw_amount()
-                cost_foreign = convert_from_krw(cost_krw, target_currency)
-                current_krw = convert_to_krw(cost_foreign, target_currency)
 
                 categories.append({
                     "code": item.type,
@@ -304,7 +238,13 @@ class FeedFavoriteView(APIView):
         if FeedFavorite.objects.filter(user=request.user, snapshot=snapshot).exists():
             return bad("이미 좋아요를 누른 요약본입니다.")
 
-        favorite = FeedFavorite.objects.create(user=request.user, snapshot=snapshot)
+        # 행 추가와 좋아요 수 증가를 한 트랜잭션으로 (동시에 눌러서 unique 충돌이 나면 이미 누른 것으로 처리)
+        try:
+            with transaction.atomic():
+                favorite = FeedFavorite.objects.create(user=request.user, snapshot=snapshot)
+                SummarySnapshot.objects.filter(pk=snapshot.pk).update(like_count=F("like_count") + 1)
+        except IntegrityError:
+            return bad("이미 좋아요를 누른 요약본입니다.")
         serializer = FeedFavoriteSerializer(favorite)
 
         return ok("가계부 요약본 좋아요 추가 성공", serializer.data, status=status.HTTP_201_CREATED)
@@ -316,7 +256,11 @@ class FeedFavoriteView(APIView):
         if not favorite:
             return bad("좋아요를 누르지 않은 요약본입니다.", status=status.HTTP_404_NOT_FOUND)
 
-        favorite.delete()
+        # 실제로 지운 경우에만 감소 (동시 삭제 시 두 번 빼지 않도록)
+        with transaction.atomic():
+            deleted, _ = FeedFavorite.objects.filter(pk=favorite.pk).delete()
+            if deleted:
+                SummarySnapshot.objects.filter(pk=snapshot.pk, like_count__gt=0).update(like_count=F("like_count") - 1)
         return ok("가계부 요약본 좋아요 삭제 성공", status=status.HTTP_204_NO_CONTENT)
 
 
@@ -329,7 +273,12 @@ class FeedScrapView(APIView):
         if FeedScrap.objects.filter(user=request.user, snapshot=snapshot).exists():
             return bad("이미 스크랩한 요약본입니다.")
 
-        scrap = FeedScrap.objects.create(user=request.user, snapshot=snapshot)
+        try:
+            with transaction.atomic():
+                scrap = FeedScrap.objects.create(user=request.user, snapshot=snapshot)
+                SummarySnapshot.objects.filter(pk=snapshot.pk).update(scrap_count=F("scrap_count") + 1)
+        except IntegrityError:
+            return bad("이미 스크랩한 요약본입니다.")
         serializer = FeedScrapSerializer(scrap)
         return ok("가계부 요약본 스크랩 추가 성공", serializer.data, status=status.HTTP_201_CREATED)
 
@@ -340,7 +289,10 @@ class FeedScrapView(APIView):
         if not scrap:
             return bad("스크랩하지 않은 요약본입니다.", status=status.HTTP_404_NOT_FOUND)
 
-        scrap.delete()
+        with transaction.atomic():
+            deleted, _ = FeedScrap.objects.filter(pk=scrap.pk).delete()
+            if deleted:
+                SummarySnapshot.objects.filter(pk=snapshot.pk, scrap_count__gt=0).update(scrap_count=F("scrap_count") - 1)
         return ok("가계부 요약본 스크랩 삭제 성공", status=status.HTTP_204_NO_CONTENT)
 
 
@@ -351,7 +303,7 @@ class MyScrapListView(APIView):
         scraps = (
             FeedScrap.objects
             .filter(user=request.user)
-            .select_related("snapshot__user", "snapshot__exchange_profile")
+            .select_related("snapshot__user__feed_card", "snapshot__exchange_profile")
             .order_by("-created_at")
         )
 
@@ -360,21 +312,9 @@ class MyScrapListView(APIView):
         data = serializer.data
 
         for feed_data, snapshot in zip(data, snapshots):
-            user = snapshot.user
+            # 총 파견비용(Ledger + BaseBudget), 평균 생활비(Ledger만)는 작성자별 FeedCard에 저장된 값 사용
             months = get_months(snapshot.snapshot_exchange_period)
-
-            # 총 파견비용 = Ledger + BaseBudget
-            total_foreign, total_krw = get_total_expense_with_budget(user)
-
-            # 평균 생활비 = Ledger만 (BaseBudget 제외)
-            ledger_foreign, ledger_krw = get_total_ledger_expense(user)
-            avg_foreign = safe_divide(ledger_foreign, months)
-            avg_krw = safe_divide(ledger_krw, months)
-
-            feed_data["base_dispatch_foreign_amount"] = str(total_foreign.quantize(Decimal("0.01")))
-            feed_data["base_dispatch_krw_amount"] = str(total_krw.quantize(Decimal("0.01")))
-            feed_data["living_expense_foreign_amount"] = str(avg_foreign.quantize(Decimal("0.01")))
-            feed_data["living_expense_krw_amount"] = str(avg_krw.quantize(Decimal("0.01")))
+            apply_feed_card(feed_data, get_feed_card(snapshot.user), months)
 
         return ok("내 스크랩 목록 조회 성공", data)
 
@@ -0,0 +1,50 @@
+import os
+import signal
+import socket
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs.queue import JOB_LEASE_SECONDS, claim_batch, purge_finished, run_job
+
+# 대기 중 완료 작업 정리 주기(초)
+PURGE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = "DB 작업 큐(jobs.Job)의 작업을 배치로 가져와 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10, help="한 번에 임대하는 작업 수")
+        parser.add_argument("--lease", type=int, default=JOB_LEASE_SECONDS, help="작업 임대 시간(초), 넘기면 다른 워커가 다시 가져감")
+        parser.add_argument("--sleep", type=float, default=1.0, help="실행할 작업이 없을 때 대기(초)")
+        parser.add_argument("--worker-id", default=f"{socket.gethostname()}:{os.getpid()}", help="임대 기록에 남길 워커 이름")
+        parser.add_argument("--once", action="store_true", help="지금 실행할 수 있는 작업만 처리하고 종료")
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        last_purge = 0
+        while not self._stopping:
+            close_old_connections()
+            jobs = claim_batch(options["worker_id"], options["batch_size"], options["lease"])
+            if not jobs:
+                if options["once"]:
+                    break
+                if time.monotonic() - last_purge > PURGE_INTERVAL:
+                    purge_finished()
+                    last_purge = time.monotonic()
+                time.sleep(options["sleep"])
+                continue
+
+            # 종료 신호를 받아도 임대한 배치는 끝까지 처리 (남기면 임대 만료까지 대기)
+            for job in jobs:
+                done = run_job(job, options["lease"])
+                self.stdout.write(f"[{datetime.now()}] {job.task} #{job.pk} {'완료' if done else '실패'} (시도 {job.attempts}/{job.max_attempts})")
+
+    def _stop(self, signum, frame):
+        self._stopping = True
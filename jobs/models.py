@@ -0,0 +1,34 @@
+from django.db import models
+
+
+#DB 기반 작업 큐 (별도 브로커 없이 SQLite/MySQL에서 동작)
+#워커가 행을 가져갈 때 locked_by/locked_until(임대)을 기록 -> 워커가 죽으면 임대가 끝난 뒤 다른 워커가 다시 가져감
+class Job(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "대기"
+        RUNNING = "RUNNING", "실행 중"
+        DONE = "DONE", "완료"
+        FAILED = "FAILED", "실패"
+
+    task = models.CharField(max_length=200)  #실행할 함수의 dotted path (예: summaries.tasks.create_snapshot)
+    payload = models.JSONField(default=dict, blank=True)  #함수에 넘길 키워드 인자
+    #같은 작업 중복 등록 방지 키, 대기 중일 때만 값이 있고 워커가 가져가면 NULL (NULL은 unique 제약에서 중복 허용)
+    dedupe_key = models.CharField(max_length=255, null=True, blank=True, unique=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField()  #이 시각 이후에 실행 (재시도 대기 포함)
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="job_status_run_after_idx"),
+            models.Index(fields=["status", "locked_until"], name="job_status_locked_until_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
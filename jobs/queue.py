@@ -0,0 +1,150 @@
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+"""
+    # DB 기반 작업 큐
+    1. enqueue: 요청 트랜잭션 안에서 Job 행 INSERT -> 요청이 롤백되면 작업도 같이 사라짐
+       - dedupe_key를 주면 같은 키의 대기 중 작업이 있을 때 새로 만들지 않고 그 작업을 반환
+         (unique 제약으로 보장하므로 동시에 등록해도 한 행만 생김, 워커가 가져갈 때 키를 비움)
+    2. claim_batch: 실행할 수 있는 행(대기 중 + 실행 시각 지남, 또는 임대가 끝난 실행 중 행)을
+       조건부 UPDATE 한 번으로 가져감 -> 여러 워커가 동시에 돌아도 행마다 한 워커만 성공 (SELECT FOR UPDATE 불필요)
+    3. run_job: 작업 함수 실행 + 완료 표시를 한 트랜잭션으로 묶음
+       - 임대를 잃었으면(다른 워커가 가져감) 롤백 -> 작업 결과가 두 번 저장되지 않음
+       - 실패하면 JOB_RETRY_BACKOFF_SECONDS * 2^(시도-1) 뒤에 재시도, max_attempts를 넘으면 FAILED
+    4. 워커: manage.py run_worker
+"""
+
+JOB_LEASE_SECONDS = getattr(settings, "JOB_LEASE_SECONDS", 300)
+JOB_MAX_ATTEMPTS = getattr(settings, "JOB_MAX_ATTEMPTS", 5)
+JOB_RETRY_BACKOFF_SECONDS = getattr(settings, "JOB_RETRY_BACKOFF_SECONDS", 10)
+JOB_KEEP_DAYS = getattr(settings, "JOB_KEEP_DAYS", 7)
+
+
+class LeaseLost(Exception):
+    pass
+
+
+def enqueue(task, payload=None, delay=0, max_attempts=JOB_MAX_ATTEMPTS, dedupe_key=None):
+    """작업 등록, task는 키워드 인자(payload)를 받는 함수의 dotted path"""
+    fields = {
+        "task": task,
+        "payload": payload or {},
+        "max_attempts": max_attempts,
+        "run_after": timezone.now() + timedelta(seconds=delay),
+        "dedupe_key": dedupe_key,
+    }
+    if dedupe_key is None:
+        return Job.objects.create(**fields)
+
+    try:
+        with transaction.atomic():
+            return Job.objects.create(**fields)
+    except IntegrityError:
+        existing = Job.objects.filter(dedupe_key=dedupe_key).first()
+        if existing is not None:
+            return existing
+        # 그 사이 워커가 가져가서 키가 비었으면 다시 등록
+        with transaction.atomic():
+            return Job.objects.create(**fields)
+
+
+def _claimable(now):
+    return (
+        Q(status=Job.Status.PENDING, run_after__lte=now)
+        | Q(status=Job.Status.RUNNING, locked_until__lt=now)
+    )
+
+
+def claim_batch(worker_id, batch_size, lease_seconds=JOB_LEASE_SECONDS):
+    """실행할 작업을 최대 batch_size개 임대해서 반환"""
+    now = timezone.now()
+    candidates = list(
+        Job.objects.filter(_claimable(now))
+        .order_by("run_after", "id")
+        .values_list("id", flat=True)[:batch_size]
+    )
+    if not candidates:
+        return []
+
+    token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+    Job.objects.filter(_claimable(now), pk__in=candidates).update(
+        status=Job.Status.RUNNING,
+        dedupe_key=None,
+        locked_by=token,
+        locked_until=now + timedelta(seconds=lease_seconds),
+        attempts=F("attempts") + 1,
+        updated_at=now,
+    )
+    return list(Job.objects.filter(locked_by=token).order_by("run_after", "id"))
+
+
+def _release(job, status, **fields):
+    """임대를 가진 경우에만 상태 변경, 성공 여부 반환"""
+    updated = Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+        status=status,
+        locked_by="",
+        locked_until=None,
+        updated_at=timezone.now(),
+        **fields,
+    )
+    return updated == 1
+
+
+def run_job(job, lease_seconds=JOB_LEASE_SECONDS):
+    """작업 하나 실행, 성공 여부 반환"""
+    if job.attempts > job.max_attempts:
+        # 실행 중 워커가 죽어서 임대가 끝난 채로 횟수를 다 쓴 경우
+        _release(job, Job.Status.FAILED, last_error=job.last_error or "임대 만료로 재시도 횟수 초과")
+        return False
+
+    # 배치 앞 작업이 오래 걸렸을 수 있으므로 실행 직전에 임대 연장
+    renewed = Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+        locked_until=timezone.now() + timedelta(seconds=lease_seconds),
+    )
+    if not renewed:
+        return False
+
+    try:
+        with transaction.atomic():
+            import_string(job.task)(**job.payload)
+            if not _release(job, Job.Status.DONE, last_error=""):
+                raise LeaseLost()
+    except LeaseLost:
+        return False
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            _release(job, Job.Status.FAILED, last_error=error)
+        else:
+            delay = JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+            _release(
+                job,
+                Job.Status.PENDING,
+                last_error=error,
+                run_after=timezone.now() + timedelta(seconds=delay),
+            )
+        return False
+    return True
+
+
+def purge_finished(days=JOB_KEEP_DAYS, batch_size=1000):
+    """완료된 지 days일 지난 작업 행을 배치로 삭제, 삭제한 행 수 반환 (FAILED는 확인용으로 남김)"""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = 0
+    while True:
+        ids = list(
+            Job.objects.filter(status=Job.Status.DONE, updated_at__lt=cutoff)
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += Job.objects.filter(pk__in=ids).delete()[0]
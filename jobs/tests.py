@@ -0,0 +1,85 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Job
+from .queue import JOB_RETRY_BACKOFF_SECONDS, claim_batch, enqueue, run_job
+
+calls = []
+
+
+def record_call(n):
+    calls.append(n)
+
+
+def fail(n):
+    calls.append(n)
+    raise RuntimeError("작업 실패")
+
+
+# DB 작업 큐: 임대한 작업은 한 워커만, 실패하면 지수 백오프로 재시도, max_attempts를 넘으면 FAILED
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_leased_job_is_not_claimed_by_another_worker(self):
+        job = enqueue("jobs.tests.record_call", {"n": 1})
+
+        self.assertEqual([claimed.pk for claimed in claim_batch("w1", 10)], [job.pk])
+        self.assertEqual(claim_batch("w2", 10), [])
+
+    def test_expired_lease_moves_to_another_worker(self):
+        job = enqueue("jobs.tests.record_call", {"n": 1})
+        [first] = claim_batch("w1", 10, lease_seconds=60)
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        [second] = claim_batch("w2", 10)
+
+        # 임대를 잃은 워커의 실행은 롤백되고 새 워커만 완료 표시
+        self.assertFalse(run_job(first))
+        self.assertTrue(run_job(second))
+        self.assertEqual(calls, [1])
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.Status.DONE)
+
+    def test_failure_is_rescheduled_with_backoff(self):
+        job = enqueue("jobs.tests.fail", {"n": 1}, max_attempts=3)
+
+        for attempt in (1, 2):
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            [claimed] = claim_batch("w1", 10)
+            before = timezone.now()
+            self.assertFalse(run_job(claimed))
+
+            job.refresh_from_db()
+            self.assertEqual(job.status, Job.Status.PENDING)
+            self.assertEqual(job.attempts, attempt)
+            self.assertIn("작업 실패", job.last_error)
+            delay = timedelta(seconds=JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            self.assertGreaterEqual(job.run_after, before + delay)
+            self.assertEqual(claim_batch("w1", 10), [])
+
+    def test_max_attempts_marks_failed(self):
+        job = enqueue("jobs.tests.fail", {"n": 1}, max_attempts=2)
+        for _ in range(2):
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            for claimed in claim_batch("w1", 10):
+                run_job(claimed)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(calls, [1, 1])
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        self.assertEqual(claim_batch("w1", 10), [])
+
+    def test_run_worker_once_processes_due_jobs(self):
+        done = enqueue("jobs.tests.record_call", {"n": 1})
+        later = enqueue("jobs.tests.record_call", {"n": 2}, delay=3600)
+
+        call_command("run_worker", "--once", "--worker-id", "test", stdout=StringIO())
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(Job.objects.get(pk=done.pk).status, Job.Status.DONE)
+        self.assertEqual(Job.objects.get(pk=later.pk).status, Job.Status.PENDING)
@@ -1,5 +1,4 @@
 from django.contrib import admin
 from .models import *
 
-admin.site.register(Ledger)
 admin.site.register(LedgerEntry)
\ No newline at end of file
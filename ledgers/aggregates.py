@@ -0,0 +1,394 @@
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from datetime import timedelta
+
+from django.db.models import Case, Count, DecimalField, F, Q, Sum, Value, When
+
+from rates.money import Money
+from rates.utils import convert_many_from_krw, convert_many_to_krw, convert_many_to_krw_at
+from .models import LedgerEntry, LedgerMonthlyAggregate
+
+"""
+    # 가계부 합계 계산 (ledgers / summaries / feeds 공용)
+    1. 월별 합계 테이블(LedgerMonthlyAggregate) 유지/조회
+       - 가계부 등록/수정/삭제 시 같은 트랜잭션에서 add_entry / remove_entry 호출
+       - 어긋난 경우 manage.py rebuild_ledger_aggregates 로 원장에서 다시 계산
+    2. 그룹 합계 (monthly_groups)
+       - SUM(amount), SUM(amount_converted), 등록 당시 원화 합(entry_krw_sum)을
+         (entry_type, category, currency_code, converted_currency_code) 별로 합계 테이블에서 가져옴
+         -> 최대 카테고리 x 통화 개수의 행, 원장 항목 수와 무관
+       - entry_krw_sum 은 쓰기 때 항목별로 (저장된 원화 환산값 -> 원화 원본 -> 등록 시점 환율 이력) 더해 둠
+    3. 환산은 묶인 그룹마다 한 번씩만 (convert_groups, summarize_groups)
+       - 반올림(0.01 ROUND_HALF_UP)도 그룹 합계에 한 번만 적용 -> 항목별로 반올림해서 더하던 값과
+         그룹마다 최대 0.01 x 항목 수 / 2 까지 다를 수 있음 (조회 비용을 항목 수와 무관하게 두기 위한 선택)
+    4. 기간 합계 (range_groups): 일/주/월 구간별 그룹 합계
+       - 월 단위: 기간에 통째로 들어가는 달은 월별 합계 테이블, 양 끝의 걸친 달만 원장에서 조회
+       - 일/주 단위: 원장에서 날짜별로 묶어서 조회
+"""
+
+GROUP_FIELDS = ("entry_type", "category", "currency_code", "converted_currency_code")
+
+
+def _key(entry):
+    return {
+        "user_id": entry.user_id,
+        "month": entry.month,
+        "entry_type": entry.entry_type,
+        "category": entry.category,
+        "currency_code": entry.currency_code,
+        "converted_currency_code": entry.converted_currency_code or "",
+    }
+
+
+def _stored_krw(entry):
+    """등록 때 저장된 원화 환산값이 있는 항목"""
+    return entry.converted_currency_code == "KRW" and bool(entry.amount_converted)
+
+
+def entry_krw_amounts(entries):
+    """
+    항목별 등록 당시 원화 (저장된 원화 환산값 -> 원화 원본 -> 등록 시점 환율 이력, 환율이 없으면 0)
+    - 쓰기 때 월별 합계의 entry_krw_sum에 더해 두므로 조회에서는 원장을 다시 읽지 않음
+    """
+    entries = list(entries)
+    pending = [entry for entry in entries if entry.currency_code != "KRW" and not _stored_krw(entry)]
+    converted = convert_many_to_krw_at((entry.amount, entry.currency_code, entry.created_at) for entry in pending).items
+    at_entry = {id(entry): amount for entry, amount in zip(pending, converted)}
+
+    amounts = []
+    for entry in entries:
+        if _stored_krw(entry):
+            amounts.append(entry.amount_converted)
+        elif entry.currency_code == "KRW":
+            amounts.append(entry.amount)
+        else:
+            amounts.append(at_entry[id(entry)] or Decimal("0"))
+    return amounts
+
+
+def _apply(key, amount, converted, entry_krw, count):
+    if key["user_id"] is None:
+        return
+
+    with transaction.atomic():
+        updated = LedgerMonthlyAggregate.objects.filter(**key).update(
+            amount_sum=F("amount_sum") + amount,
+            converted_sum=F("converted_sum") + converted,
+            entry_krw_sum=F("entry_krw_sum") + entry_krw,
+            entry_count=F("entry_count") + count,
+        )
+        if updated:
+            if count < 0:
+                LedgerMonthlyAggregate.objects.filter(**key, entry_count=0).delete()
+            return
+
+        # 첫 항목: 동시에 같은 행을 만들면 unique 제약에 걸리므로 update로 다시 반영
+        try:
+            with transaction.atomic():
+                LedgerMonthlyAggregate.objects.create(
+                    **key, amount_sum=amount, converted_sum=converted, entry_krw_sum=entry_krw, entry_count=count,
+                )
+        except IntegrityError:
+            LedgerMonthlyAggregate.objects.filter(**key).update(
+                amount_sum=F("amount_sum") + amount,
+                converted_sum=F("converted_sum") + converted,
+                entry_krw_sum=F("entry_krw_sum") + entry_krw,
+                entry_count=F("entry_count") + count,
+            )
+
+
+def add_entry(entry):
+    entry_krw = entry_krw_amounts([entry])[0]
+    _apply(_key(entry), entry.amount, entry.amount_converted or Decimal("0"), entry_krw, 1)
+
+
+def remove_entry(entry):
+    entry_krw = entry_krw_amounts([entry])[0]
+    _apply(_key(entry), -entry.amount, -(entry.amount_converted or Decimal("0")), -entry_krw, -1)
+
+
+def add_entries(entries):
+    """일괄 등록용: 같은 그룹끼리 먼저 합친 뒤 그룹마다 한 번씩 반영"""
+    entries = list(entries)
+    deltas = {}
+    for entry, entry_krw in zip(entries, entry_krw_amounts(entries)):
+        key = tuple(sorted(_key(entry).items()))
+        amount, converted, krw, count = deltas.get(key, (Decimal("0"), Decimal("0"), Decimal("0"), 0))
+        deltas[key] = (
+            amount + entry.amount,
+            converted + (entry.amount_converted or Decimal("0")),
+            krw + entry_krw,
+            count + 1,
+        )
+    for key, (amount, converted, krw, count) in deltas.items():
+        _apply(dict(key), amount, converted, krw, count)
+
+
+def _entry_krw_sums(entries):
+    """{(user_id, month, *GROUP_FIELDS): 등록 당시 원화 합} - 원화 원본/저장된 원화 환산값은 DB 합계, 나머지만 항목별 환산"""
+    stored = Q(converted_currency_code="KRW", amount_converted__isnull=False) & ~Q(amount_converted=0)
+    rows = (
+        entries
+        .values("user_id", "month", *GROUP_FIELDS)
+        .annotate(krw_total=Sum(
+            Case(
+                When(stored, then=F("amount_converted")),
+                When(currency_code="KRW", then=F("amount")),
+                default=Value(Decimal("0")),
+                output_field=DecimalField(max_digits=18, decimal_places=2),
+            )
+        ))
+        .order_by()
+    )
+    sums = {
+        (row["user_id"], row["month"], *(row[field] or "" for field in GROUP_FIELDS)): row["krw_total"] or Decimal("0")
+        for row in rows
+    }
+
+    pending = list(
+        entries.exclude(stored).exclude(currency_code="KRW")
+        .only("user_id", "month", *GROUP_FIELDS, "amount", "amount_converted", "created_at")
+    )
+    for entry, entry_krw in zip(pending, entry_krw_amounts(pending)):
+        key = (entry.user_id, entry.month, *(getattr(entry, field) or "" for field in GROUP_FIELDS))
+        sums[key] = sums.get(key, Decimal("0")) + entry_krw
+    return sums
+
+
+def rebuild_monthly_aggregates(user_ids=None):
+    """원장(LedgerEntry)에서 월별 합계를 다시 계산, 만든 행 수 반환"""
+    entries = LedgerEntry.objects.filter(user__isnull=False)
+    aggregates = LedgerMonthlyAggregate.objects.all()
+    if user_ids is not None:
+        entries = entries.filter(user_id__in=user_ids)
+        aggregates = aggregates.filter(user_id__in=user_ids)
+
+    rows = (
+        entries
+        .values("user_id", "month", *GROUP_FIELDS)
+        .annotate(
+            amount_total=Sum("amount"),
+            converted_total=Sum("amount_converted"),
+            total_count=Count("id"),
+        )
+        .order_by()
+    )
+    krw_sums = _entry_krw_sums(entries)
+
+    with transaction.atomic():
+        aggregates.delete()
+        created = LedgerMonthlyAggregate.objects.bulk_create([
+            LedgerMonthlyAggregate(
+                user_id=row["user_id"],
+                month=row["month"],
+                entry_type=row["entry_type"],
+                category=row["category"],
+                currency_code=row["currency_code"],
+                converted_currency_code=row["converted_currency_code"] or "",
+                amount_sum=row["amount_total"],
+                converted_sum=row["converted_total"] or Decimal("0"),
+                entry_krw_sum=krw_sums.get(
+                    (row["user_id"], row["month"], *(row[field] or "" for field in GROUP_FIELDS)), Decimal("0"),
+                ),
+                entry_count=row["total_count"],
+            )
+            for row in rows
+        ], batch_size=1000)
+    return len(created)
+
+
+def monthly_groups(user, month=None, until=None, entry_type=None, categories=None):
+    """
+    (entry_type, category, currency_code, converted_currency_code) 별 합계 목록
+    - month: 해당 월만 (없으면 전체 기간 -> 원장 대신 월별 합계 행만 더함)
+    - until: month와 함께 쓰면 그 날짜 이후 항목(미래 날짜 등록분)은 원장에서 찾아 빼줌
+    - entry_type, categories: 해당 구분/카테고리만
+    """
+    qs = LedgerMonthlyAggregate.objects.filter(user=user)
+    if month is not None:
+        qs = qs.filter(month=month)
+    if entry_type is not None:
+        qs = qs.filter(entry_type=entry_type)
+    if categories is not None:
+        qs = qs.filter(category__in=categories)
+
+    groups = {}
+    for row in (
+        qs.values(*GROUP_FIELDS)
+        .annotate(
+            amount_total=Sum("amount_sum"),
+            converted_total=Sum("converted_sum"),
+            entry_krw_total=Sum("entry_krw_sum"),
+        )
+        .order_by()
+    ):
+        key = tuple(row[field] for field in GROUP_FIELDS)
+        groups[key] = {
+            **{field: row[field] for field in GROUP_FIELDS},
+            "amount_sum": row["amount_total"],
+            "converted_sum": row["converted_total"],
+            "entry_krw_sum": row["entry_krw_total"],
+        }
+
+    if month is not None and until is not None:
+        later = LedgerEntry.objects.filter(user=user, month=month, date__gt=until)
+        rows = (
+            later
+            .values(*GROUP_FIELDS)
+            .annotate(amount_total=Sum("amount"), converted_total=Sum("amount_converted"))
+            .order_by()
+        )
+        later_krw = _entry_krw_sums(later)
+        for row in rows:
+            key = tuple(row[field] or "" for field in GROUP_FIELDS)
+            group = groups.get(key)
+            if group is None:
+                continue
+            group["amount_sum"] -= row["amount_total"]
+            group["converted_sum"] -= row["converted_total"] or Decimal("0")
+            group["entry_krw_sum"] -= later_krw.get((user.id, month, *key), Decimal("0"))
+
+    return list(groups.values())
+
+
+def convert_groups(groups, foreign_currency=None):
+    """
+    그룹마다 환산 결과를 채움 (환율이 없으면 None)
+    - current_krw: 현재 환율 기준 원화
+    - entry_krw: 등록 당시 원화 (쓰기 때 쌓아 둔 entry_krw_sum, 원장은 다시 읽지 않음)
+    - entry_foreign: foreign_currency를 주면 교환국 통화 (같은 통화 항목은 원본, 나머지는 entry_krw 환산)
+    """
+    current = convert_many_to_krw((group["amount_sum"], group["currency_code"]) for group in groups).items
+
+    for group, current_krw in zip(groups, current):
+        group["current_krw"] = current_krw
+        if group["converted_currency_code"] == "KRW" and group["converted_sum"]:
+            group["entry_krw"] = group["converted_sum"]
+        elif group["currency_code"] == "KRW":
+            group["entry_krw"] = group["amount_sum"]
+        elif group["entry_krw_sum"] or current_krw is not None:
+            group["entry_krw"] = group["entry_krw_sum"]
+        else:
+            # 등록 시점/현재 환율 모두 없는 통화
+            group["entry_krw"] = None
+
+    if foreign_currency is None:
+        return groups
+
+    to_foreign = [
+        group for group in groups
+        if group["currency_code"] != foreign_currency and group["entry_krw"] is not None
+    ]
+    foreign_amounts = convert_many_from_krw((group["entry_krw"], foreign_currency) for group in to_foreign).items
+    for group in groups:
+        group["entry_foreign"] = group["amount_sum"] if group["entry_krw"] is not None else None
+    for group, foreign in zip(to_foreign, foreign_amounts):
+        group["entry_foreign"] = foreign
+    return groups
+
+
+def summarize_groups(groups, foreign_currency):
+    """
+    수입/지출 요약용 (외화, 원화) 합
+    - 원화: 등록 당시 원화 환산 합 -> 원화 원본 합 -> 현재 환율 환산
+    - 외화: 등록 당시 외화 환산 합 -> 원화 합을 현재 환율로 환산
+    """
+    krw_amounts = convert_many_to_krw(
+        (group["converted_sum"], "KRW")
+        if group["converted_currency_code"] == "KRW" and group["converted_sum"]
+        else (group["amount_sum"], group["currency_code"])
+        for group in groups
+    ).items
+    krw_amounts = [krw or Decimal("0.00") for krw in krw_amounts]
+
+    if foreign_currency == "KRW":
+        foreign_amounts = krw_amounts
+    else:
+        converted = convert_many_from_krw((krw, foreign_currency) for krw in krw_amounts).items
+        foreign_amounts = [
+            group["converted_sum"]
+            if group["converted_currency_code"] == foreign_currency and group["converted_sum"]
+            else foreign or Decimal("0.00")
+            for group, foreign in zip(groups, converted)
+        ]
+
+    total_foreign = Money.zero(foreign_currency)
+    total_krw = Money.zero("KRW")
+    for krw_amount, foreign_amount in zip(krw_amounts, foreign_amounts):
+        total_krw += Money.from_decimal(krw_amount, "KRW")
+        total_foreign += Money.from_decimal(foreign_amount, foreign_currency)
+    return total_foreign.to_decimal(), total_krw.to_decimal()
+
+
+RANGE_FIELDS = ("entry_type", "currency_code", "converted_currency_code")
+
+
+def bucket_start(day, group_by):
+    """날짜가 속한 구간의 시작일 (day: 그날, week: 월요일, month: 1일)"""
+    if group_by == "month":
+        return day.replace(day=1)
+    if group_by == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def range_groups(user, date_from, date_to, group_by):
+    """date_from ~ date_to (양끝 포함) 항목을 구간 시작일별로 묶은 {구간 시작일: [그룹 합계]}"""
+    if group_by == "month":
+        months = []
+        month = date_from.replace(day=1)
+        while month <= date_to:
+            months.append(month)
+            month = (month + timedelta(days=32)).replace(day=1)
+        full_months = [
+            month for month in months
+            if month >= date_from and (month + timedelta(days=32)).replace(day=1) - timedelta(days=1) <= date_to
+        ]
+        edge_months = [month for month in months if month not in full_months]
+
+        rows = list(
+            LedgerMonthlyAggregate.objects
+            .filter(user=user, month__in=full_months)
+            .values("month", *RANGE_FIELDS)
+            .annotate(amount_total=Sum("amount_sum"), converted_total=Sum("converted_sum"))
+            .order_by()
+        )
+        if edge_months:
+            rows += list(
+                LedgerEntry.objects
+                .filter(user=user, month__in=edge_months, date__gte=date_from, date__lte=date_to)
+                .values("month", *RANGE_FIELDS)
+                .annotate(amount_total=Sum("amount"), converted_total=Sum("amount_converted"))
+                .order_by()
+            )
+        bucket_of = lambda row: row["month"]
+    else:
+        rows = (
+            LedgerEntry.objects
+            .filter(user=user, date__gte=date_from, date__lte=date_to)
+            .values("date", *RANGE_FIELDS)
+            .annotate(amount_total=Sum("amount"), converted_total=Sum("amount_converted"))
+            .order_by()
+        )
+        bucket_of = lambda row: bucket_start(row["date"], group_by)
+
+    # 같은 구간/통화 조합은 하나로 합쳐서 구간마다 통화별 한 번만 환산
+    merged = {}
+    for row in rows:
+        key = (bucket_of(row), *(row[field] or "" for field in RANGE_FIELDS))
+        group = merged.get(key)
+        if group is None:
+            merged[key] = {
+                **{field: row[field] or "" for field in RANGE_FIELDS},
+                "amount_sum": row["amount_total"],
+                "converted_sum": row["converted_total"] or Decimal("0"),
+            }
+        else:
+            group["amount_sum"] += row["amount_total"]
+            group["converted_sum"] += row["converted_total"] or Decimal("0")
+
+    buckets = {}
+    for key, group in merged.items():
+        buckets.setdefault(key[0], []).append(group)
+    return buckets
@@ -0,0 +1,87 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+"""
+    # Idempotency-Key 처리 (가계부 등록 재시도 중복 방지)
+    1. 등록 트랜잭션 안에서 (user, key) 행을 먼저 INSERT -> unique 제약으로 동시 요청 중 하나만 통과
+    2. 통과한 요청은 항목 저장 후 응답(상태 코드 + 본문)을 같은 행에 기록
+    3. 같은 키로 다시 오면 저장된 응답을 그대로 반환 (INSERT/환산 없음)
+       - 본문이 다르면 422, 아직 처리 중이면 409
+    4. 만료(IDEMPOTENCY_KEY_TTL_HOURS)된 행은 manage.py purge_idempotency_keys 로 배치 삭제
+"""
+
+IDEMPOTENCY_KEY_TTL = timedelta(hours=getattr(settings, "IDEMPOTENCY_KEY_TTL_HOURS", 24))
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyError(Exception):
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def _request_hash(data):
+    raw = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def claim(user, key, data):
+    """(행, 재사용 여부) 반환, 재사용이면 행에 저장된 응답을 돌려주면 됨 (트랜잭션 안에서 호출)"""
+    if len(key) > MAX_KEY_LENGTH:
+        raise IdempotencyKeyError(f"Idempotency-Key는 최대 {MAX_KEY_LENGTH}자입니다.", 400)
+
+    digest = _request_hash(data)
+    now = timezone.now()
+    IdempotencyKey.objects.filter(user=user, key=key, expires_at__lte=now).delete()
+
+    try:
+        with transaction.atomic():
+            record = IdempotencyKey.objects.create(
+                user=user, key=key, request_hash=digest, expires_at=now + IDEMPOTENCY_KEY_TTL,
+            )
+        return record, False
+    except IntegrityError:
+        record = IdempotencyKey.objects.filter(user=user, key=key).first()
+
+    if record is None or record.status_code is None:
+        raise IdempotencyKeyError("같은 Idempotency-Key 요청을 처리 중입니다.", 409)
+    if record.request_hash != digest:
+        raise IdempotencyKeyError("같은 Idempotency-Key로 다른 요청을 보낼 수 없습니다.", 422)
+    return record, True
+
+
+def store_response(record, response):
+    record.status_code = response.status_code
+    record.response_body = response.data
+    record.save(update_fields=["status_code", "response_body"])
+
+
+def replay_response(record):
+    response = Response(record.response_body, status=record.status_code)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def purge_expired(batch_size=1000):
+    """만료된 키를 batch_size씩 나눠서 삭제, 삭제한 행 수 반환"""
+    now = timezone.now()
+    deleted = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(expires_at__lte=now)
+            .order_by("expires_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from ledgers.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = "만료된 Idempotency-Key 행을 배치로 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="DELETE 한 번에 지우는 행 수")
+
+    def handle(self, *args, **options):
+        deleted = purge_expired(options["batch_size"])
+        self.stdout.write(f"만료된 Idempotency-Key 삭제 완료 ({deleted}행)")
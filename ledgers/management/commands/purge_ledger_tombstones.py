@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from ledgers.tombstones import purge_expired
+
+
+class Command(BaseCommand):
+    help = "보관 기간(LEDGER_TOMBSTONE_RETENTION_DAYS)이 지난 가계부 삭제 기록을 배치로 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="DELETE 한 번에 지우는 행 수")
+
+    def handle(self, *args, **options):
+        deleted = purge_expired(options["batch_size"])
+        self.stdout.write(f"보관 기간이 지난 삭제 기록 삭제 완료 ({deleted}행)")
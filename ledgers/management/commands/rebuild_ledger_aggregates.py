@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from ledgers.aggregates import rebuild_monthly_aggregates
+
+
+class Command(BaseCommand):
+    help = "가계부 항목(LedgerEntry)에서 월별 합계(LedgerMonthlyAggregate)를 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", dest="users", help="특정 사용자 id만 (여러 번 지정 가능)")
+
+    def handle(self, *args, **options):
+        created = rebuild_monthly_aggregates(options["users"])
+        self.stdout.write(f"월별 합계 재계산 완료 ({created}행)")
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+# 기존 가계부 항목으로 월별 합계 채우기
+def fill_aggregates(apps, schema_editor):
+    LedgerEntry = apps.get_model("ledgers", "LedgerEntry")
+    LedgerMonthlyAggregate = apps.get_model("ledgers", "LedgerMonthlyAggregate")
+    rows = (
+        LedgerEntry.objects
+        .filter(user__isnull=False)
+        .annotate(month=TruncMonth("date"))
+        .values("user_id", "month", "entry_type", "category", "currency_code", "converted_currency_code")
+        .annotate(amount_total=Sum("amount"), converted_total=Sum("amount_converted"), total_count=Count("id"))
+        .order_by()
+    )
+    LedgerMonthlyAggregate.objects.bulk_create([
+        LedgerMonthlyAggregate(
+            user_id=row["user_id"],
+            month=row["month"],
+            entry_type=row["entry_type"],
+            category=row["category"],
+            currency_code=row["currency_code"],
+            converted_currency_code=row["converted_currency_code"] or "",
+            amount_sum=row["amount_total"],
+            converted_sum=row["converted_total"] or 0,
+            entry_count=row["total_count"],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('ledgers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerMonthlyAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='해당 월의 1일')),
+                ('entry_type', models.CharField(choices=[('EXPENSE', '지출'), ('INCOME', '수입')], max_length=10)),
+                ('category', models.CharField(choices=[('FOOD', '식비'), ('HOUSING', '주거비'), ('TRANSPORT', '교통비'), ('SHOPPING', '쇼핑비'), ('TRAVEL', '여행비'), ('STUDY_MATERIALS', '교재비'), ('ALLOWANCE', '용돈'), ('ETC', '기타')], max_length=20)),
+                ('currency_code', models.CharField(max_length=3)),
+                ('converted_currency_code', models.CharField(blank=True, default='', max_length=3)),
+                ('amount_sum', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('converted_sum', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_monthly_aggregates', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='ledgermonthlyaggregate',
+            constraint=models.UniqueConstraint(fields=('user', 'month', 'entry_type', 'category', 'currency_code', 'converted_currency_code'), name='uniq_ledger_monthly_aggregate'),
+        ),
+        migrations.RunPython(fill_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:30
+
+from django.db import migrations, models
+
+
+# 기존 항목의 month를 id 순으로 나눠서 채움 (한 번에 큰 UPDATE를 피하기 위해)
+def fill_month(apps, schema_editor):
+    LedgerEntry = apps.get_model("ledgers", "LedgerEntry")
+    chunk_size = 2000
+    last_id = 0
+    while True:
+        entries = list(
+            LedgerEntry.objects
+            .filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "date")[:chunk_size]
+        )
+        if not entries:
+            break
+        for entry in entries:
+            entry.month = entry.date.replace(day=1)
+        LedgerEntry.objects.bulk_update(entries, ["month"])
+        last_id = entries[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ledgers', '0003_ledgerentry_user_date_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ledgerentry',
+            name='month',
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_month, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='ledgerentry',
+            name='month',
+            field=models.DateField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['user', 'month'], name='ledger_user_month_idx'),
+        ),
+        migrations.DeleteModel(
+            name='Ledger',
+        ),
+    ]
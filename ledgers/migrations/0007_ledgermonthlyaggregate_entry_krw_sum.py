@@ -0,0 +1,79 @@
+# Generated by Django 4.2.24 on 2026-10-18 21:40
+
+from bisect import bisect_right
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import migrations, models
+from django.db.models import Q, Sum
+
+
+# 기존 월별 합계 행에 등록 당시 원화 합 채우기
+# - 저장된 원화 환산값 -> 원화 원본 -> 등록 시점 환율 이력 -> 현재 환율 순 (rates.utils.convert_many_to_krw_at 과 같은 규칙)
+def fill_entry_krw_sum(apps, schema_editor):
+    LedgerEntry = apps.get_model("ledgers", "LedgerEntry")
+    LedgerMonthlyAggregate = apps.get_model("ledgers", "LedgerMonthlyAggregate")
+    ExchangeRate = apps.get_model("rates", "ExchangeRate")
+    ExchangeRateHistory = apps.get_model("rates", "ExchangeRateHistory")
+
+    group_fields = ("user_id", "month", "entry_type", "category", "currency_code", "converted_currency_code")
+    sums = {}
+
+    def add(row, amount):
+        key = tuple(row[field] or "" if field == "converted_currency_code" else row[field] for field in group_fields)
+        sums[key] = sums.get(key, Decimal("0")) + amount
+
+    entries = LedgerEntry.objects.filter(user__isnull=False)
+    stored = Q(converted_currency_code="KRW", amount_converted__isnull=False) & ~Q(amount_converted=0)
+    for row in entries.filter(stored).values(*group_fields).annotate(total=Sum("amount_converted")).order_by():
+        add(row, row["total"])
+    for row in entries.exclude(stored).filter(currency_code="KRW").values(*group_fields).annotate(total=Sum("amount")).order_by():
+        add(row, row["total"])
+
+    pending = entries.exclude(stored).exclude(currency_code="KRW")
+    currencies = set(pending.values_list("currency_code", flat=True).distinct())
+    current = dict(ExchangeRate.objects.filter(target_currency__in=currencies).values_list("target_currency", "rate"))
+    history = {}
+    for currency, effective_at, rate in (
+        ExchangeRateHistory.objects
+        .filter(target_currency__in=currencies)
+        .order_by("target_currency", "effective_at")
+        .values_list("target_currency", "effective_at", "rate")
+    ):
+        times, values = history.setdefault(currency, ([], []))
+        times.append(effective_at)
+        values.append(rate)
+
+    for row in pending.values(*group_fields, "amount", "created_at").iterator():
+        rate = None
+        times, values = history.get(row["currency_code"], ([], []))
+        index = bisect_right(times, row["created_at"]) if row["created_at"] is not None else 0
+        if index:
+            rate = values[index - 1]
+        if rate is None:
+            rate = current.get(row["currency_code"])
+        if not rate:
+            continue
+        add(row, (Decimal(row["amount"]) / Decimal(rate)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+    for aggregate in LedgerMonthlyAggregate.objects.all().iterator():
+        key = tuple(getattr(aggregate, field) for field in group_fields)
+        if key in sums:
+            aggregate.entry_krw_sum = sums[key]
+            aggregate.save(update_fields=["entry_krw_sum"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rates', '0003_rategeneration'),
+        ('ledgers', '0006_ledgerentrytombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ledgermonthlyaggregate',
+            name='entry_krw_sum',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=18),
+        ),
+        migrations.RunPython(fill_entry_krw_sum, migrations.RunPython.noop),
+    ]
@@ -27,6 +27,8 @@ class LedgerEntry(models.Model):
     date = models.DateField()
     payment_method = models.CharField(max_length=10, choices=PaymentMethod.choices, null=True, blank=True)
     category = models.CharField(max_length=20, choices=Category.choices)
+    # date가 속한 달의 1일 (save 때 자동으로 맞춤, bulk_create 등은 직접 채워야 함)
+    month = models.DateField(editable=False)
 
     # 원본 금액 + 원본 화폐
     amount = models.DecimalField(max_digits=10, decimal_places=2)
@@ -39,11 +41,74 @@ class LedgerEntry(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # 날짜별 조회 커서 (-date, -created_at, -id) 범위 스캔용
+            models.Index(fields=["user", "date", "created_at"], name="ledger_user_date_created_idx"),
+            # 월 단위 조회용
+            models.Index(fields=["user", "month"], name="ledger_user_month_idx"),
+            # 동기화 (updated_at, id) 이후 변경분 조회용
+            models.Index(fields=["user", "updated_at"], name="ledger_user_updated_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.month = self.date.replace(day=1)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "date" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "month"}
+        super().save(*args, **kwargs)
+
+# 월별 합계 (사용자, 월, 수입/지출, 카테고리, 통화) 단위로 가계부 쓰기 때 함께 갱신
+class LedgerMonthlyAggregate(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="ledger_monthly_aggregates")
+    month = models.DateField(help_text="해당 월의 1일")
+    entry_type = models.CharField(max_length=10, choices=LedgerEntry.EntryType.choices)
+    category = models.CharField(max_length=20, choices=LedgerEntry.Category.choices)
+    currency_code = models.CharField(max_length=3)
+    # 환산 안 된 항목은 "" (NULL은 unique 제약에서 중복 허용되므로)
+    converted_currency_code = models.CharField(max_length=3, blank=True, default="")
+
+    # 원본 금액 합 / 환산 금액 합 (converted_currency_code가 KRW면 등록 당시 원화 합)
+    amount_sum = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    converted_sum = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    # 등록 당시 원화 합 (저장된 원화 환산값 -> 원화 원본 -> 등록 시점 환율 이력), 조회 때 원장을 다시 읽지 않기 위함
+    entry_krw_sum = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    entry_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "month", "entry_type", "category", "currency_code", "converted_currency_code"],
+                name="uniq_ledger_monthly_aggregate",
+            ),
+        ]
+
+
+# 가계부 등록 재시도 중복 방지 (Idempotency-Key 헤더), 만료된 행은 purge_idempotency_keys로 정리
+class IdempotencyKey(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="idempotency_keys")
+    key = models.CharField(max_length=255)
+    # 같은 키로 다른 내용을 보낸 경우를 구분하기 위한 요청 본문 해시
+    request_hash = models.CharField(max_length=64)
+    # 처리 중이면 비어 있음
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="uniq_idempotency_user_key"),
+        ]
+
 
-class Ledger(models.Model):
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="ledgers_user")
-    ledger_entries = models.ManyToManyField(LedgerEntry, related_name="ledgers_entries", blank=True)
-    month = models.DateField(help_text="LedgerEntry에서 몇 월인지 참고")
+# 삭제된 가계부 항목 기록 (오프라인 클라이언트 동기화용), 보관 기간이 지난 행은 purge_ledger_tombstones로 정리
+class LedgerEntryTombstone(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="ledger_tombstones")
+    entry_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        unique_together = ("user", "month")
\ No newline at end of file
+        indexes = [
+            models.Index(fields=["user", "deleted_at"], name="ledger_tombstone_user_idx"),
+        ]
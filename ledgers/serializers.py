@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import *
 from rates.views import convert_to_krw, convert_from_krw
+from rates.utils import convert_many_to_krw, convert_many_from_krw
 from decimal import Decimal, InvalidOperation
 
 
@@ -85,20 +86,27 @@ class LedgerEntryCreateSerializer(serializers.ModelSerializer):
         data["currency_code"] = str(currency_code).upper()
         return data
 
+    def _target_currency(self, user):
+        # 원화 항목을 환산할 교환국 통화 (없거나 KRW면 None)
+        exchange_profile = getattr(user, "exchange_profile", None)
+        if exchange_profile is None:
+            return None
+        country_name = exchange_profile.exchange_country
+        if not country_name:
+            return None
+        country_name = country_name.strip()
+        target_currency = COUNTRY_TO_CURRENCY.get(country_name)
+        if target_currency is None:
+            return None
+        if target_currency == "KRW":
+            return None
+        return target_currency
+
     def _convert_amount(self, user, original_amount: Decimal, original_currency: str):
         if original_currency == "KRW":
-            exchange_profile = getattr(user, "exchange_profile", None)
-            if exchange_profile is None:
-                return None, None
-            country_name = exchange_profile.exchange_country
-            if not country_name:
-                return None, None
-            country_name = country_name.strip()
-            target_currency = COUNTRY_TO_CURRENCY.get(country_name)
+            target_currency = self._target_currency(user)
             if target_currency is None:
                 return None, None
-            if target_currency == "KRW":
-                return None, None
             converted_amount = convert_from_krw(original_amount, target_currency)
             if converted_amount is None:
                 return None, None
@@ -108,6 +116,27 @@ class LedgerEntryCreateSerializer(serializers.ModelSerializer):
             return None, None
         return converted_amount, "KRW"
 
+    def convert_many(self, user, rows):
+        """_convert_amount와 같은 규칙으로 검증된 여러 행을 한 환율 스냅샷으로 환산, [(환산 금액, 환산 통화)]"""
+        target_currency = self._target_currency(user)
+        from_krw = convert_many_from_krw(
+            (row["amount"], target_currency) for row in rows if row["currency_code"] == "KRW" and target_currency
+        ).items
+        to_krw = convert_many_to_krw(
+            (row["amount"], row["currency_code"]) for row in rows if row["currency_code"] != "KRW"
+        ).items
+
+        from_krw, to_krw = iter(from_krw), iter(to_krw)
+        results = []
+        for row in rows:
+            if row["currency_code"] == "KRW":
+                converted = next(from_krw) if target_currency else None
+                results.append((converted, target_currency) if converted is not None else (None, None))
+            else:
+                converted = next(to_krw)
+                results.append((converted, "KRW") if converted is not None else (None, None))
+        return results
+
     def create(self, validated_data):
         user = self.context["request"].user
         original_amount: Decimal = validated_data["amount"]
@@ -185,6 +214,38 @@ class ThisMonthSummarySerializer(serializers.Serializer):
         }
 
 
+class RangeSummarySerializer(serializers.Serializer):
+    def _amounts(self, item, kind, foreign_currency):
+        return {
+            "foreign_amount": str(safe_decimal(item[f"{kind}_foreign"])),
+            "foreign_currency": foreign_currency,
+            "krw_amount": str(safe_decimal(item[f"{kind}_krw"])),
+            "krw_currency": "KRW",
+        }
+
+    def to_representation(self, instance):
+        foreign_currency = instance["foreign_currency"]
+        return {
+            "from": instance["from"],
+            "to": instance["to"],
+            "group": instance["group"],
+            "series": [
+                {
+                    "period": item["period"],
+                    "start": item["start"],
+                    "end": item["end"],
+                    "expense": self._amounts(item, "expense", foreign_currency),
+                    "income": self._amounts(item, "income", foreign_currency),
+                }
+                for item in instance["series"]
+            ],
+            "total": {
+                "expense": self._amounts(instance["total"], "expense", foreign_currency),
+                "income": self._amounts(instance["total"], "income", foreign_currency),
+            },
+        }
+
+
 class BudgetDiffWithKrwSerializer(serializers.Serializer):
     foreign_amount = serializers.SerializerMethodField()
     foreign_currency = serializers.CharField()
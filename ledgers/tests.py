@@ -1,3 +1,256 @@
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from rates.models import ExchangeRate
+from rates.provider import invalidate_rates
+from rates.utils import convert_from_krw, convert_to_krw
+
+from .aggregates import add_entry, convert_groups, monthly_groups, rebuild_monthly_aggregates, summarize_groups
+from . import tombstones
+from .idempotency import purge_expired
+from .models import IdempotencyKey, LedgerEntry, LedgerEntryTombstone, LedgerMonthlyAggregate
+
+
+def _create_rates():
+    for currency, rate in [("KRW", "1"), ("USD", "0.000721"), ("JPY", "0.107312")]:
+        ExchangeRate.objects.create(base_currency="KRW", target_currency=currency, rate=Decimal(rate))
+    invalidate_rates()
+
+
+def _aggregate_rows(user):
+    return sorted(
+        LedgerMonthlyAggregate.objects.filter(user=user).values_list(
+            "month", "entry_type", "category", "currency_code", "converted_currency_code",
+            "amount_sum", "converted_sum", "entry_krw_sum", "entry_count",
+        )
+    )
+
+
+class LedgerTestMixin:
+    def setUp(self):
+        _create_rates()
+        self.user = User.objects.create(username="ledger", nickname="ledger")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _entry_body(self, amount, currency="USD", category="FOOD", entry_type="EXPENSE"):
+        return {
+            "entry_type": entry_type,
+            "date": date.today().isoformat(),
+            "category": category,
+            "payment_method": "CARD",
+            "amount": amount,
+            "currency_code": currency,
+        }
+
+
+# 월별 합계 테이블: (월, 구분, 카테고리, 통화) 그룹마다 한 행, 원장에서 다시 계산한 값과 같아야 함
+class MonthlyAggregateTests(LedgerTestMixin, TestCase):
+    def test_one_row_per_group_after_create_update_delete(self):
+        ids = []
+        for amount in ["3.33", "3.34", "12.00", "0.05"]:
+            response = self.client.post("/ledgers/fill/", self._entry_body(amount), format="json")
+            self.assertEqual(response.status_code, 201)
+            ids.append(response.data["data"]["id"])
+        self.client.post("/ledgers/fill/", self._entry_body("1000", currency="KRW"), format="json")
+
+        self.assertEqual(LedgerMonthlyAggregate.objects.filter(user=self.user).count(), 2)
+
+        self.assertEqual(self.client.put(f"/ledgers/fill/{ids[0]}/", self._entry_body("7.77"), format="json").status_code, 200)
+        self.assertEqual(self.client.delete(f"/ledgers/fill/{ids[1]}/").status_code, 204)
+
+        maintained = _aggregate_rows(self.user)
+        rebuild_monthly_aggregates([self.user.id])
+        self.assertEqual(maintained, _aggregate_rows(self.user))
+
+    def test_summary_converts_each_group_once(self):
+        for amount in ["3.33", "3.33", "3.33"]:
+            self.client.post("/ledgers/fill/", self._entry_body(amount, currency="JPY"), format="json")
+
+        # 환산값이 저장된 항목은 저장된 원화 합, 교환국 통화는 원화 합을 한 번 환산 (그룹 단위 반올림)
+        krw_sum = sum(LedgerEntry.objects.filter(user=self.user).values_list("amount_converted", flat=True))
+        total_foreign, total_krw = summarize_groups(
+            [group for group in monthly_groups(self.user) if group["entry_type"] == "EXPENSE"], "USD",
+        )
+        self.assertEqual(total_krw, krw_sum)
+        self.assertEqual(total_foreign, convert_from_krw(krw_sum, "USD"))
+
+    def test_entry_krw_comes_from_stored_sums(self):
+        # 환산값 없이 저장된 외화 항목: 등록 때 합계 행에 등록 당시 원화를 더해 두고, 조회는 원장을 읽지 않음
+        for amount in ["10.00", "2.50"]:
+            entry = LedgerEntry.objects.create(
+                user=self.user, entry_type="EXPENSE", date=date.today(), category="FOOD",
+                payment_method="CARD", amount=Decimal(amount), currency_code="USD",
+            )
+            add_entry(entry)
+        expected = convert_to_krw(Decimal("10.00"), "USD") + convert_to_krw(Decimal("2.50"), "USD")
+
+        with self.assertNumQueries(1):
+            groups = convert_groups(monthly_groups(self.user), "USD")
+        self.assertEqual(groups[0]["entry_krw"], expected)
+        self.assertEqual(groups[0]["entry_foreign"], Decimal("12.50"))
+
+        maintained = _aggregate_rows(self.user)
+        rebuild_monthly_aggregates([self.user.id])
+        self.assertEqual(maintained, _aggregate_rows(self.user))
+
+
+# Idempotency-Key: 같은 키 재시도는 한 번만 저장, 다른 본문은 422, 처리 중이면 409
+class IdempotencyKeyTests(LedgerTestMixin, TestCase):
+    def _post(self, body, key):
+        return self.client.post("/ledgers/fill/", body, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_replayed_key_inserts_once(self):
+        first = self._post(self._entry_body("3.33"), "retry-1")
+        second = self._post(self._entry_body("3.33"), "retry-1")
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(LedgerEntry.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(LedgerMonthlyAggregate.objects.get(user=self.user).entry_count, 1)
+
+    def test_different_body_with_same_key_is_rejected(self):
+        self._post(self._entry_body("3.33"), "retry-1")
+        response = self._post(self._entry_body("4.44"), "retry-1")
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(LedgerEntry.objects.filter(user=self.user).count(), 1)
+
+    def test_in_flight_key_is_conflict(self):
+        body = self._entry_body("3.33")
+        IdempotencyKey.objects.create(
+            user=self.user, key="retry-1", request_hash="pending",
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        response = self._post(body, "retry-1")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(LedgerEntry.objects.filter(user=self.user).exists())
+
+    def test_purge_expired_deletes_only_expired_keys(self):
+        now = timezone.now()
+        for index in range(3):
+            IdempotencyKey.objects.create(
+                user=self.user, key=f"old-{index}", request_hash="x", status_code=201,
+                expires_at=now - timedelta(minutes=1),
+            )
+        IdempotencyKey.objects.create(
+            user=self.user, key="fresh", request_hash="x", status_code=201,
+            expires_at=now + timedelta(hours=1),
+        )
+
+        self.assertEqual(purge_expired(batch_size=2), 3)
+        self.assertEqual(list(IdempotencyKey.objects.values_list("key", flat=True)), ["fresh"])
+
+
+# 변경분 동기화: (updated_at, id) 커서, 최근 2초 변경분은 다음 동기화로 미룸, 삭제 기록 전달 및 보관 기간
+class LedgerSyncTests(LedgerTestMixin, TestCase):
+    def _sync(self, since=None, page_size=None, now=None):
+        params = {}
+        if since is not None:
+            params["since"] = since
+        if page_size is not None:
+            params["page_size"] = page_size
+        with mock.patch("ledgers.views.timezone.now", return_value=now or timezone.now()):
+            return self.client.get("/ledgers/sync/", params)
+
+    def _create(self, amount, seconds_ago):
+        entry_id = self.client.post("/ledgers/fill/", self._entry_body(amount), format="json").data["data"]["id"]
+        LedgerEntry.objects.filter(pk=entry_id).update(updated_at=timezone.now() - timedelta(seconds=seconds_ago))
+        return entry_id
+
+    def test_cursor_pages_through_changes(self):
+        first_id = self._create("1.00", seconds_ago=30)
+        second_id = self._create("2.00", seconds_ago=20)
+
+        page = self._sync(page_size=1).data["data"]
+        self.assertEqual([row["id"] for row in page["changed"]], [first_id])
+        self.assertTrue(page["has_more"])
+
+        page = self._sync(since=page["next_cursor"], page_size=1).data["data"]
+        self.assertEqual([row["id"] for row in page["changed"]], [second_id])
+
+        page = self._sync(since=page["next_cursor"], page_size=1).data["data"]
+        self.assertEqual(page["changed"], [])
+        self.assertFalse(page["has_more"])
+
+    def test_recent_changes_wait_for_lag(self):
+        old_id = self._create("1.00", seconds_ago=30)
+        recent_id = self._create("2.00", seconds_ago=1)
+
+        page = self._sync().data["data"]
+        self.assertEqual([row["id"] for row in page["changed"]], [old_id])
+
+        # 2초가 지난 뒤에는 같은 커서로 놓쳤던 변경분을 받음
+        later = self._sync(since=page["next_cursor"], now=timezone.now() + timedelta(seconds=3)).data["data"]
+        self.assertEqual([row["id"] for row in later["changed"]], [recent_id])
+
+    def test_deleted_entries_are_returned(self):
+        entry_id = self._create("1.00", seconds_ago=30)
+        cursor = self._sync().data["data"]["next_cursor"]
+
+        self.assertEqual(self.client.delete(f"/ledgers/fill/{entry_id}/").status_code, 204)
+        page = self._sync(since=cursor, now=timezone.now() + timedelta(seconds=3)).data["data"]
+        self.assertEqual(page["deleted"], [entry_id])
+        self.assertEqual(page["changed"], [])
+
+    def test_cursor_older_than_retention_is_gone(self):
+        cursor = self._sync().data["data"]["next_cursor"]
+        response = self._sync(since=cursor, now=timezone.now() + tombstones.TOMBSTONE_RETENTION + timedelta(days=1))
+        self.assertEqual(response.status_code, 410)
+
+    def test_purge_expired_tombstones(self):
+        old = LedgerEntryTombstone.objects.create(user=self.user, entry_id=1)
+        LedgerEntryTombstone.objects.filter(pk=old.pk).update(
+            deleted_at=timezone.now() - tombstones.TOMBSTONE_RETENTION - timedelta(minutes=1),
+        )
+        LedgerEntryTombstone.objects.create(user=self.user, entry_id=2)
+
+        self.assertEqual(tombstones.purge_expired(), 1)
+        self.assertEqual(list(LedgerEntryTombstone.objects.values_list("entry_id", flat=True)), [2])
+
+
+# 내보내기(ndjson/json/csv) -> 다른 사용자로 가져오기: 월별 합계가 원장에서 다시 계산한 값과 같아야 함
+class ExportImportRoundTripTests(LedgerTestMixin, TestCase):
+    def test_round_trip_keeps_aggregates(self):
+        last_month = (date.today().replace(day=1) - timedelta(days=1)).isoformat()
+        for amount, currency, category in [
+            ("3.33", "USD", "FOOD"), ("12.00", "USD", "FOOD"), ("1500", "JPY", "TRAVEL"), ("10000", "KRW", "HOUSING"),
+        ]:
+            self.client.post("/ledgers/fill/", self._entry_body(amount, currency, category), format="json")
+        body = {**self._entry_body("50000", "KRW", "ALLOWANCE", "INCOME"), "date": last_month}
+        self.client.post("/ledgers/fill/", body, format="json")
+        expected = _aggregate_rows(self.user)
+
+        for output in ("ndjson", "json", "csv"):
+            with self.subTest(output=output):
+                raw = b"".join(
+                    chunk if isinstance(chunk, bytes) else chunk.encode()
+                    for chunk in self.client.get("/ledgers/export/", {"output": output}).streaming_content
+                ).decode("utf-8")
+
+                importer = User.objects.create(username=f"import-{output}", nickname=f"import-{output}")
+                client = APIClient()
+                client.force_authenticate(importer)
+                if output == "csv":
+                    response = client.post("/ledgers/import/", raw.encode("utf-8"), content_type="text/csv")
+                elif output == "ndjson":
+                    rows = [json.loads(line) for line in raw.splitlines() if line]
+                    response = client.post("/ledgers/import/", rows, format="json")
+                else:
+                    response = client.post("/ledgers/import/", json.loads(raw), format="json")
+                self.assertEqual(response.status_code, 201)
 
-# Create your tests here.
+                maintained = _aggregate_rows(importer)
+                rebuild_monthly_aggregates([importer.id])
+                self.assertEqual(maintained, _aggregate_rows(importer))
+                self.assertEqual(maintained, expected)
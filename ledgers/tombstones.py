@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import LedgerEntryTombstone
+
+"""
+    # 삭제 기록(LedgerEntryTombstone) 보관 기간 = 동기화 허용 기간
+    1. 가계부 항목 삭제 시 (user, entry_id) 기록 -> 동기화(/ledgers/sync/)의 deleted 로 전달
+    2. LEDGER_TOMBSTONE_RETENTION_DAYS(기본 30일)가 지난 기록은 manage.py purge_ledger_tombstones 로 배치 삭제
+    3. 마지막 동기화(since 커서의 삭제 시각)가 보관 기간보다 오래된 클라이언트는 지워진 삭제 기록을 받을 수 없으므로
+       410을 받고 since 없이 전체 동기화부터 다시 해야 함
+"""
+
+TOMBSTONE_RETENTION = timedelta(days=getattr(settings, "LEDGER_TOMBSTONE_RETENTION_DAYS", 30))
+
+
+def retention_cutoff(now=None):
+    """이 시각 이전의 삭제 기록은 지워졌을 수 있음"""
+    return (now or timezone.now()) - TOMBSTONE_RETENTION
+
+
+def purge_expired(batch_size=1000):
+    """보관 기간이 지난 삭제 기록을 batch_size씩 나눠서 삭제, 삭제한 행 수 반환"""
+    cutoff = retention_cutoff()
+    deleted = 0
+    while True:
+        ids = list(
+            LedgerEntryTombstone.objects.filter(deleted_at__lt=cutoff)
+            .order_by("deleted_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += LedgerEntryTombstone.objects.filter(id__in=ids).delete()[0]
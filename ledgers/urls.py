@@ -7,9 +7,13 @@ urlpatterns = [
     path('fill/', LedgerEntryCreateView.as_view(), name='ledgerCreate'),
     path("date/", MyLedgerAllDateView.as_view(), name="ledger_by_date"),
     path("category/", MyLedgerAllCategoryView.as_view(), name="ledger_by_category"),
+    path("export/", LedgerExportView.as_view(), name="ledger_export"),
+    path("import/", LedgerImportView.as_view(), name="ledger_import"),
+    path("sync/", LedgerSyncView.as_view(), name="ledger_sync"),
     path("fill/<int:ledger_id>/", LedgerEntryDetailView.as_view(), name="ledger_detail"),
     path("fill/<int:ledger_id>", LedgerEntryDetailView.as_view()), # 슬래시 없는 url도 가능하도록
     path("thisMonth/", ThisMonthSummaryView.as_view(), name="this_month_summary"),
     path("totalMonth/", TotalSummaryView.as_view(), name="total_summary"),
+    path("range/", RangeSummaryView.as_view(), name="range_summary"),
 
 ]
\ No newline at end of file
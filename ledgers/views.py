@@ -2,15 +2,39 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from datetime import datetime, date as date_type
+from datetime import datetime, date as date_type, timedelta
 from collections import defaultdict
 from datetime import date
-from django.db.models import QuerySet
-from rates.views import convert_to_krw, convert_from_krw
+from copy import copy
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+import binascii
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+import csv
+import io
+import json
+from rates.views import convert_from_krw
+from rates.utils import convert_many_to_krw, convert_many_from_krw
+from rates.money import Money
 
 from .serializers import *
 from .models import *
+from . import idempotency, tombstones
+from .aggregates import (
+    add_entry,
+    add_entries,
+    bucket_start,
+    monthly_groups,
+    range_groups,
+    remove_entry,
+    summarize_groups,
+)
 from budgets.models import Budget, LivingBudget, BaseBudget, BaseBudgetItem
+from accounts.versioning import bump_data_version, etag_by_data_version
 from decimal import Decimal, InvalidOperation
 
 
@@ -24,6 +48,24 @@ LIVING_CATEGORIES = {
     "STUDY_MATERIALS",
 }
 
+# 날짜별 조회 페이지 크기 (기본 / 최대)
+LEDGER_PAGE_SIZE = getattr(settings, "LEDGER_PAGE_SIZE", 100)
+LEDGER_MAX_PAGE_SIZE = getattr(settings, "LEDGER_MAX_PAGE_SIZE", 500)
+
+# 내보내기 때 DB에서 한 번에 읽는 행 수
+LEDGER_EXPORT_CHUNK_SIZE = getattr(settings, "LEDGER_EXPORT_CHUNK_SIZE", 2000)
+
+# 일괄 등록 최대 행 수 / INSERT 한 번에 넣는 행 수
+LEDGER_IMPORT_MAX_ROWS = getattr(settings, "LEDGER_IMPORT_MAX_ROWS", 10000)
+LEDGER_IMPORT_BATCH_SIZE = getattr(settings, "LEDGER_IMPORT_BATCH_SIZE", 1000)
+# 동기화 때 아직 커밋 중일 수 있는 최근 변경분을 다음으로 미루는 시간(초)
+LEDGER_SYNC_LAG_SECONDS = getattr(settings, "LEDGER_SYNC_LAG_SECONDS", 2)
+
+# 기간별 합계 최대 조회 일수
+LEDGER_RANGE_MAX_DAYS = getattr(settings, "LEDGER_RANGE_MAX_DAYS", 731)
+
+LEDGER_IMPORT_FIELDS = ("entry_type", "date", "payment_method", "category", "amount", "currency_code")
+
 COUNTRY_TO_CURRENCY = {
     "한국": "KRW",
     "미국": "USD",
@@ -71,56 +113,345 @@ class LedgerEntryCreateView(APIView):
         if not serializer.is_valid():
             return bad("유효성 검사 실패", serializer.errors, status=400)
 
-        entry = serializer.save()
+        # 재시도 요청이면 저장된 응답 반환 (Idempotency-Key 헤더가 있을 때만)
+        idempotency_key = request.headers.get("Idempotency-Key")
+        with transaction.atomic():
+            if idempotency_key:
+                try:
+                    record, replay = idempotency.claim(request.user, idempotency_key, request.data)
+                except idempotency.IdempotencyKeyError as e:
+                    return bad("등록 실패", e.message, status=e.status)
+                if replay:
+                    return idempotency.replay_response(record)
+
+            entry = serializer.save()
+            add_entry(entry)
+
+            data = LedgerEntrySimpleSerializer(entry).data
+            response = ok("등록 완료", data, status=201)
+            if idempotency_key:
+                idempotency.store_response(record, response)
+        return response
+
+
+# 가계부 일괄 등록 (스프레드시트 이전용)
+# - JSON 배열 (또는 {"items": [...]}), CSV 본문(text/csv), CSV 파일 업로드(multipart "file") 지원
+# - CSV 열: entry_type,date,payment_method,category,amount,currency_code (내보내기 CSV의 나머지 열은 무시)
+# - LedgerEntryCreateSerializer 규칙으로 한꺼번에 검증 -> 하나라도 실패하면 아무것도 저장하지 않음
+# - 환산은 한 환율 스냅샷으로 일괄, 저장은 bulk_create 배치, 월별 합계도 일괄 반영
+class LedgerImportView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        month_first = entry.date.replace(day=1)
-        ledger, _ = Ledger.objects.get_or_create(user=request.user, month=month_first)
-        ledger.ledger_entries.add(entry)
+    def post(self, request):
+        try:
+            rows = _import_rows(request)
+        except ValueError as e:
+            return bad("가져오기 실패", str(e), status=400)
+        if not rows:
+            return bad("가져오기 실패", "가져올 항목이 없습니다.", status=400)
+        if len(rows) > LEDGER_IMPORT_MAX_ROWS:
+            return bad("가져오기 실패", f"한 번에 최대 {LEDGER_IMPORT_MAX_ROWS}개까지 가져올 수 있습니다.", status=400)
+
+        serializer = LedgerEntryCreateSerializer(data=rows, many=True, context={"request": request})
+        if not serializer.is_valid():
+            errors = {index: error for index, error in enumerate(serializer.errors) if error}
+            return bad("유효성 검사 실패", errors, status=400)
 
-        data = LedgerEntrySimpleSerializer(entry).data
-        return ok("등록 완료", data, status=201)
+        user = request.user
+        validated = serializer.validated_data
+        conversions = serializer.child.convert_many(user, validated)
+        entries = [
+            LedgerEntry(
+                user=user,
+                **data,
+                month=data["date"].replace(day=1),
+                amount_converted=converted_amount,
+                converted_currency_code=converted_currency,
+            )
+            for data, (converted_amount, converted_currency) in zip(validated, conversions)
+        ]
+
+        with transaction.atomic():
+            LedgerEntry.objects.bulk_create(entries, batch_size=LEDGER_IMPORT_BATCH_SIZE)
+            add_entries(entries)
+            # bulk_create는 post_save를 보내지 않으므로 직접 버전 증가
+            bump_data_version(user.id, sender=LedgerEntry)
+
+        return ok("가져오기 완료", {"created": len(entries)}, status=201)
+
+
+def _import_rows(request):
+    upload = request.FILES.get("file") if request.content_type.startswith("multipart/") else None
+    if upload is not None:
+        return _csv_rows(upload.read())
+    if request.content_type.startswith("text/csv"):
+        return _csv_rows(request.body)
 
+    data = request.data
+    if isinstance(data, dict):
+        data = data.get("items")
+    if not isinstance(data, list):
+        raise ValueError("JSON 배열 또는 CSV를 보내주세요.")
+    return data
 
+
+def _csv_rows(raw):
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValueError("CSV는 UTF-8 이어야 합니다.")
+    rows = []
+    for row in csv.DictReader(io.StringIO(text)):
+        rows.append({
+            field: (row.get(field) or "").strip() or None
+            for field in LEDGER_IMPORT_FIELDS
+        })
+    return rows
+
+
+# 날짜별 가계부 조회 (커서 페이지네이션)
+# - ?month=YYYY-MM : 해당 월만
+# - ?page_size=N : 한 번에 가져올 항목 수 (기본 LEDGER_PAGE_SIZE, 최대 LEDGER_MAX_PAGE_SIZE)
+# - ?cursor=... : 이전 응답의 next_cursor (없으면 처음부터, 마지막 페이지면 next_cursor는 null)
+# - page_size, cursor 둘 다 없으면 기존 클라이언트용으로 전체 목록을 한 번에 반환 (next_cursor 없음)
+# - (-date, -created_at, -id) 순서라 (user, date, created_at) 인덱스 범위 스캔으로 한 페이지만 읽음
 class MyLedgerAllDateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        qs = (
-            LedgerEntry.objects
-            .filter(user=request.user)
-            .order_by("-date", "-created_at")
-        )
+        params = request.query_params
+        paginated = "page_size" in params or "cursor" in params
+        try:
+            page_size = _page_size(params.get("page_size"))
+            month_start = _parse_month(params.get("month"))
+            cursor = _decode_cursor(params.get("cursor"))
+        except ValueError as e:
+            return bad("조회 실패", str(e), status=400)
+
+        qs = LedgerEntry.objects.filter(user=request.user)
+        if month_start is not None:
+            qs = qs.filter(month=month_start)
+        if cursor is not None:
+            cursor_date, cursor_created_at, cursor_id = cursor
+            qs = qs.filter(
+                Q(date__lt=cursor_date)
+                | Q(date=cursor_date, created_at__lt=cursor_created_at)
+                | Q(date=cursor_date, created_at=cursor_created_at, id__lt=cursor_id)
+            )
 
-        months = defaultdict(list)
-        for e in qs:
-            month_key = e.date.replace(day=1)
-            months[month_key].append(e)
+        qs = qs.order_by("-date", "-created_at", "-id")
+        entries = list(qs[:page_size + 1] if paginated else qs)
+        next_cursor = None
+        if paginated and len(entries) > page_size:
+            entries = entries[:page_size]
+            next_cursor = _encode_cursor(entries[-1])
 
+        # 페이지 전체를 한 번에 직렬화한 뒤 월/일로 묶음 (이미 정렬된 순서 유지)
+        items = LedgerEntrySimpleSerializer(entries, many=True).data
         month_blocks = []
-        for month_key in sorted(months.keys(), reverse=True):
-            days_map = defaultdict(list)
-            for e in months[month_key]:
-                days_map[e.date].append(e)
-
-            days = []
-            for day in sorted(days_map.keys(), reverse=True):
-                items = LedgerEntrySimpleSerializer(days_map[day], many=True).data
+        for e, item in zip(entries, items):
+            month_key = e.date.strftime("%Y-%m")
+            if not month_blocks or month_blocks[-1]["month"] != month_key:
+                month_blocks.append({"month": month_key, "days": []})
+            days = month_blocks[-1]["days"]
+            if not days or days[-1]["date"] != e.date.isoformat():
                 days.append(
                     {
-                        "date": day.isoformat(),
-                        "weekday_ko": _weekday_ko(day),
-                        "items": items,
+                        "date": e.date.isoformat(),
+                        "weekday_ko": _weekday_ko(e.date),
+                        "items": [],
                     }
                 )
+            days[-1]["items"].append(item)
 
-            month_blocks.append(
-                {
-                    "month": month_key.strftime("%Y-%m"),
-                    "days": days,
-                }
+        if not paginated:
+            return ok("내 가계부 전체 조회 성공", month_blocks)
+        return Response(
+            {"message": "내 가계부 전체 조회 성공", "data": month_blocks, "next_cursor": next_cursor},
+            status=200,
+        )
+
+
+# 전체 가계부 내보내기 (스트리밍)
+# - ?output=ndjson (기본, 한 줄에 항목 하나) / ?output=json (JSON 배열) / ?output=csv (다시 가져오기 가능)
+#   (DRF가 format 파라미터를 렌더러 선택에 쓰므로 output 사용)
+# - LedgerEntry를 iterator(chunk_size)로 읽으면서 바로 내보내므로 항목 수와 관계없이 메모리 일정
+# - 항목 필드는 LedgerEntrySimpleSerializer와 동일
+class LedgerExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        output = request.query_params.get("output", "ndjson")
+        if output not in ("ndjson", "json", "csv"):
+            return bad("내보내기 실패", "output은 ndjson, json, csv 중 하나여야 합니다.", status=400)
+
+        entries = (
+            LedgerEntry.objects
+            .filter(user=request.user)
+            .order_by("-date", "-created_at", "-id")
+            .iterator(chunk_size=LEDGER_EXPORT_CHUNK_SIZE)
+        )
+        if output == "ndjson":
+            response = StreamingHttpResponse(_export_ndjson(entries), content_type="application/x-ndjson")
+        elif output == "csv":
+            response = StreamingHttpResponse(_export_csv(entries), content_type="text/csv; charset=utf-8")
+        else:
+            response = StreamingHttpResponse(_export_json_array(entries), content_type="application/json")
+        response["Content-Disposition"] = f'attachment; filename="ledger.{output}"'
+        return response
+
+
+def _export_rows(entries):
+    serializer = LedgerEntrySimpleSerializer()
+    for entry in entries:
+        yield json.dumps(serializer.to_representation(entry), cls=JSONEncoder, ensure_ascii=False)
+
+
+def _export_ndjson(entries):
+    for row in _export_rows(entries):
+        yield row + "\n"
+
+
+# csv.writer가 쓴 한 줄을 그대로 돌려받기 위한 버퍼
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _export_csv(entries):
+    fields = LedgerEntrySimpleSerializer.Meta.fields
+    serializer = LedgerEntrySimpleSerializer()
+    writer = csv.writer(_Echo())
+    yield "\ufeff" + writer.writerow(fields)
+    for entry in entries:
+        data = serializer.to_representation(entry)
+        yield writer.writerow(["" if data[field] is None else data[field] for field in fields])
+
+
+def _export_json_array(entries):
+    yield "["
+    for index, row in enumerate(_export_rows(entries)):
+        yield row if index == 0 else "," + row
+    yield "]"
+
+
+# 변경분 동기화 (오프라인 클라이언트용)
+# - ?since=... : 이전 응답의 next_cursor (없으면 처음부터 전체 항목, 삭제 기록은 지금부터)
+# - ?page_size=N : 변경/삭제 각각 최대 N개, has_more가 true면 next_cursor로 이어서 요청
+# - changed: (updated_at, id) 순 생성/수정 항목, deleted: (deleted_at, id) 순 삭제된 항목 id
+# - 커밋이 늦게 끝난 쓰기를 놓치지 않도록 최근 LEDGER_SYNC_LAG_SECONDS초 이내 변경분은 다음 동기화에 포함
+# - 삭제 기록은 LEDGER_TOMBSTONE_RETENTION_DAYS일만 보관 -> 그보다 오래된 since는 410, since 없이 전체 동기화부터 다시
+class LedgerSyncView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        until = timezone.now() - timedelta(seconds=LEDGER_SYNC_LAG_SECONDS)
+        try:
+            page_size = _page_size(request.query_params.get("page_size"))
+            cursor = _decode_sync_cursor(request.query_params.get("since"))
+        except ValueError as e:
+            return bad("동기화 실패", str(e), status=400)
+        if cursor is None:
+            cursor = (None, 0, until, 0)
+        elif cursor[2] < tombstones.retention_cutoff():
+            return bad("동기화 실패", "마지막 동기화가 삭제 기록 보관 기간보다 오래되었습니다. since 없이 다시 동기화하세요.", status=410)
+        changed_at, changed_id, deleted_at, deleted_id = cursor
+
+        changed_qs = LedgerEntry.objects.filter(user=request.user, updated_at__lte=until)
+        if changed_at is not None:
+            changed_qs = changed_qs.filter(
+                Q(updated_at__gt=changed_at) | Q(updated_at=changed_at, id__gt=changed_id)
             )
+        changed = list(changed_qs.order_by("updated_at", "id")[:page_size + 1])
 
-        return ok("내 가계부 전체 조회 성공", month_blocks)
+        deleted = list(
+            LedgerEntryTombstone.objects
+            .filter(user=request.user, deleted_at__lte=until)
+            .filter(Q(deleted_at__gt=deleted_at) | Q(deleted_at=deleted_at, id__gt=deleted_id))
+            .order_by("deleted_at", "id")[:page_size + 1]
+        )
+
+        has_more = len(changed) > page_size or len(deleted) > page_size
+        changed, deleted = changed[:page_size], deleted[:page_size]
+        if changed:
+            changed_at, changed_id = changed[-1].updated_at, changed[-1].id
+        if deleted:
+            deleted_at, deleted_id = deleted[-1].deleted_at, deleted[-1].id
+
+        data = {
+            "changed": LedgerEntrySimpleSerializer(changed, many=True).data,
+            "deleted": [tombstone.entry_id for tombstone in deleted],
+            "has_more": has_more,
+            "next_cursor": _encode_sync_cursor(changed_at, changed_id, deleted_at, deleted_id),
+        }
+        return ok("동기화 조회 성공", data)
+
+
+# 동기화 커서: 마지막으로 받은 (updated_at, id), (deleted_at, id)
+def _encode_sync_cursor(changed_at, changed_id, deleted_at, deleted_id):
+    raw = "|".join([
+        changed_at.isoformat() if changed_at else "",
+        str(changed_id),
+        deleted_at.isoformat(),
+        str(deleted_id),
+    ])
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_sync_cursor(raw):
+    if raw in (None, ""):
+        return None
+    try:
+        changed_at, changed_id, deleted_at, deleted_id = urlsafe_b64decode(raw.encode()).decode().split("|")
+        return (
+            datetime.fromisoformat(changed_at) if changed_at else None,
+            int(changed_id),
+            datetime.fromisoformat(deleted_at),
+            int(deleted_id),
+        )
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise ValueError("잘못된 since 입니다.")
+
+
+def _page_size(raw):
+    if raw in (None, ""):
+        return LEDGER_PAGE_SIZE
+    try:
+        size = int(raw)
+    except (TypeError, ValueError):
+        raise ValueError("page_size는 정수여야 합니다.")
+    if size <= 0:
+        raise ValueError("page_size는 0보다 커야 합니다.")
+    return min(size, LEDGER_MAX_PAGE_SIZE)
+
+
+def _parse_month(raw):
+    if raw in (None, ""):
+        return None
+    try:
+        return datetime.strptime(raw, "%Y-%m").date()
+    except ValueError:
+        raise ValueError("month는 YYYY-MM 형식이어야 합니다.")
+
+
+# 커서: 마지막 항목의 (date, created_at, id)를 base64로 감싼 문자열
+def _encode_cursor(entry):
+    raw = f"{entry.date.isoformat()}|{entry.created_at.isoformat()}|{entry.id}"
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(raw):
+    if raw in (None, ""):
+        return None
+    try:
+        cursor_date, cursor_created_at, cursor_id = urlsafe_b64decode(raw.encode()).decode().split("|")
+        return (
+            date_type.fromisoformat(cursor_date),
+            datetime.fromisoformat(cursor_created_at),
+            int(cursor_id),
+        )
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise ValueError("잘못된 cursor 입니다.")
 
 
 def _weekday_ko(d: date_type) -> str:
@@ -131,38 +462,40 @@ def _weekday_ko(d: date_type) -> str:
 class MyLedgerAllCategoryView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @etag_by_data_version
     def get(self, request):
         user = request.user
         today = date.today()
         month_start = today.replace(day=1)
 
-        entries = (
-            LedgerEntry.objects
-            .filter(user=user, date__gte=month_start, date__lte=today)
-            .order_by("-date", "-created_at")
-        )
+        # 이번 달 월별 합계 행 (오늘 이후 날짜 항목은 제외)
+        groups = monthly_groups(user, month=month_start, until=today)
 
         foreign_currency = self._foreign_currency(user)
 
-        # 카테고리별 합계
-        category_totals = defaultdict(lambda: {"krw": Decimal("0.00"), "foreign": Decimal("0.00")})
-        living_krw_total = Decimal("0.00")
-        living_foreign_total = Decimal("0.00")
+        # 카테고리별 합계 (루프 안에서는 정수 Money로 합산)
+        category_totals = defaultdict(lambda: {"krw": Money.zero("KRW"), "foreign": Money.zero(foreign_currency)})
+        living_krw_total = Money.zero("KRW")
+        living_foreign_total = Money.zero(foreign_currency)
 
-        for entry in entries:
-            krw_amount = self._to_krw(entry)
-            if krw_amount is None:
-                continue
-            foreign_amount = self._to_foreign(krw_amount, foreign_currency)
-            category_totals[entry.category]["krw"] += krw_amount
-            category_totals[entry.category]["foreign"] += foreign_amount
+        # 현재 환율 환산은 합계 행마다 한 번씩 (KRW 항목은 그대로)
+        krw_amounts = convert_many_to_krw((group["amount_sum"], group["currency_code"]) for group in groups).items
+        converted = [(group, krw) for group, krw in zip(groups, krw_amounts) if krw is not None]
+        foreign_amounts = convert_many_from_krw((krw, foreign_currency) for _, krw in converted).items
+
+        for (group, krw_amount), foreign_amount in zip(converted, foreign_amounts):
+            krw_money = Money.from_decimal(krw_amount, "KRW")
+            foreign_money = Money.from_decimal(foreign_amount or 0, foreign_currency)
+            totals = category_totals[group["category"]]
+            totals["krw"] += krw_money
+            totals["foreign"] += foreign_money
 
-            if entry.category in LIVING_CATEGORIES:
-                living_krw_total += krw_amount
-                living_foreign_total += foreign_amount
+            if group["category"] in LIVING_CATEGORIES:
+                living_krw_total += krw_money
+                living_foreign_total += foreign_money
 
-        living_krw_total = living_krw_total.quantize(Decimal("0.01"))
-        living_foreign_total = living_foreign_total.quantize(Decimal("0.01"))
+        living_krw_total = living_krw_total.to_decimal()
+        living_foreign_total = living_foreign_total.to_decimal()
 
         # 예산(LivingBudget) 비교 (한화 기준으로만)
         budget = Budget.objects.filter(user=user).first()
@@ -190,13 +523,15 @@ class MyLedgerAllCategoryView(APIView):
 
         if budget and hasattr(budget, "base_budget"):
             base_budget = budget.base_budget
-            items = base_budget.items.all()
+            items = list(base_budget.items.all())
             total_krw = Decimal("0.00")
             total_foreign = Decimal("0.00")
 
-            for item in items:
-                krw_amount = safe_decimal(item.exchange_amount)
-                foreign_amount = safe_decimal(convert_from_krw(krw_amount, foreign_currency))
+            krw_amounts = [safe_decimal(item.exchange_amount) for item in items]
+            foreign_amounts = convert_many_from_krw((krw, foreign_currency) for krw in krw_amounts).items
+
+            for item, krw_amount, foreign_amount in zip(items, krw_amounts, foreign_amounts):
+                foreign_amount = safe_decimal(foreign_amount)
                 total_krw += krw_amount
                 total_foreign += foreign_amount
 
@@ -236,9 +571,9 @@ class MyLedgerAllCategoryView(APIView):
         for code in existing_codes:
             if code == "ALLOWANCE":
                 continue
-            summed = category_totals.get(code, {"krw": Decimal("0.00"), "foreign": Decimal("0.00")})
-            actual_krw = summed["krw"]
-            actual_foreign = summed["foreign"]
+            summed = category_totals.get(code)
+            actual_krw = summed["krw"].to_decimal() if summed else Decimal("0.00")
+            actual_foreign = summed["foreign"].to_decimal() if summed else Decimal("0.00")
             budget_foreign_diff = None
             sign = None
 
@@ -286,19 +621,6 @@ class MyLedgerAllCategoryView(APIView):
         serializer = MonthlyCategoryDashboardSerializer(payload)
         return ok("내 가계부 카테고리별 합산 조회 성공", serializer.data)
 
-    def _to_krw(self, entry: LedgerEntry):
-        if entry.currency_code == "KRW":
-            return entry.amount
-        return convert_to_krw(entry.amount, entry.currency_code)
-
-    def _to_foreign(self, krw_amount: Decimal, foreign_currency: str):
-        if foreign_currency == "KRW":
-            return krw_amount
-        converted = convert_from_krw(krw_amount, foreign_currency)
-        if converted is None:
-            return Decimal("0.00")
-        return converted
-
     def _foreign_currency(self, user):
         exchange_profile = getattr(user, "exchange_profile", None)
         if not exchange_profile:
@@ -326,7 +648,7 @@ class LedgerEntryDetailView(APIView):
         if entry is None:
             return bad("수정 실패", "없거나 권한 없음", status=404)
 
-        old_date = entry.date
+        previous = copy(entry)
 
         serializer = LedgerEntryCreateSerializer(
             entry,
@@ -337,23 +659,10 @@ class LedgerEntryDetailView(APIView):
         if not serializer.is_valid():
             return bad("유효성 검사 실패", serializer.errors, status=400)
 
-        updated = serializer.save()
-
-        if updated.date != old_date:
-            old_month = old_date.replace(day=1)
-            new_month = updated.date.replace(day=1)
-
-            try:
-                old_ledger = Ledger.objects.get(user=request.user, month=old_month)
-                old_ledger.ledger_entries.remove(updated)
-            except Ledger.DoesNotExist:
-                pass
-
-            new_ledger, _ = Ledger.objects.get_or_create(
-                user=request.user,
-                month=new_month,
-            )
-            new_ledger.ledger_entries.add(updated)
+        with transaction.atomic():
+            updated = serializer.save()
+            remove_entry(previous)
+            add_entry(updated)
 
         return ok(
             "가계부 항목이 수정되었습니다.",
@@ -366,55 +675,20 @@ class LedgerEntryDetailView(APIView):
         if entry is None:
             return bad("삭제 실패", "없거나 권한 없음", status=404)
 
-        entry.delete()
+        with transaction.atomic():
+            remove_entry(entry)
+            LedgerEntryTombstone.objects.create(user=request.user, entry_id=entry.id)
+            entry.delete()
         return Response({"message": "가계부 항목이 삭제되었습니다."}, status=204)
 
 
-class ThisMonthSummaryView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    def get(self, request):
-        user = request.user
-        today = date.today()
-        month_start = today.replace(day=1)
-        entries = LedgerEntry.objects.filter(
-            user=user,
-            date__gte=month_start,
-            date__lte=today,
-        )
-
-        result = self._calculate_summary(user, entries, today)
-        serializer = ThisMonthSummarySerializer(result)
-        return ok("이번달 수입/지출 합계 조회 성공", serializer.data)
-
-    def _calculate_summary(self, user, entries, today=None):
-        foreign_currency = self._foreign_currency(user)
+# 수입/지출 합계 공통 (이번 달 / 전체 기간 / 기간별)
+class LedgerSummaryMixin:
+    def _calculate_summary(self, user, groups, today=None, foreign_currency=None):
+        foreign_currency = foreign_currency or self._foreign_currency(user)
 
         def _sum(entry_type):
-            qs = entries.filter(entry_type=entry_type)
-            total_foreign = Decimal("0.00")
-            total_krw = Decimal("0.00")
-
-            for entry in qs:
-                krw_amount = safe_decimal(
-                    entry.amount_converted if entry.amount_converted and entry.converted_currency_code == "KRW"
-                    else entry.amount if entry.currency_code == "KRW"
-                    else convert_to_krw(entry.amount, entry.currency_code)
-                )
-
-                total_krw += krw_amount
-
-                if foreign_currency == "KRW":
-                    total_foreign += krw_amount
-                else:
-                    if entry.amount_converted and entry.converted_currency_code == foreign_currency:
-                        total_foreign += safe_decimal(entry.amount_converted)
-                    else:
-                        total_foreign += safe_decimal(convert_from_krw(krw_amount, foreign_currency))
-
-            total_foreign = total_foreign.quantize(Decimal("0.01"))
-            total_krw = total_krw.quantize(Decimal("0.01"))
-            return total_foreign, total_krw
+            return summarize_groups([group for group in groups if group["entry_type"] == entry_type], foreign_currency)
 
         income_foreign, income_krw = _sum(LedgerEntry.EntryType.INCOME)
         expense_foreign, expense_krw = _sum(LedgerEntry.EntryType.EXPENSE)
@@ -441,65 +715,97 @@ class ThisMonthSummaryView(APIView):
         return COUNTRY_TO_CURRENCY.get(name, "KRW")
 
 
-class TotalSummaryView(APIView):
+class ThisMonthSummaryView(LedgerSummaryMixin, APIView):
     permission_classes = [IsAuthenticated]
 
+    @etag_by_data_version
     def get(self, request):
         user = request.user
-        entries = LedgerEntry.objects.filter(user=user)
-        result = self._calculate_summary(user, entries)
+        today = date.today()
+        month_start = today.replace(day=1)
+        groups = monthly_groups(user, month=month_start, until=today)
+
+        result = self._calculate_summary(user, groups, today)
         serializer = ThisMonthSummarySerializer(result)
-        return ok("전체 수입/지출 합계 조회 성공", serializer.data)
+        return ok("이번달 수입/지출 합계 조회 성공", serializer.data)
 
-    def _calculate_summary(self, user, entries, today=None):
-        foreign_currency = self._foreign_currency(user)
 
-        def _sum(entry_type):
-            qs = entries.filter(entry_type=entry_type)
-            total_foreign = Decimal("0.00")
-            total_krw = Decimal("0.00")
+class TotalSummaryView(LedgerSummaryMixin, APIView):
+    permission_classes = [IsAuthenticated]
 
-            for entry in qs:
-                krw_amount = safe_decimal(
-                    entry.amount_converted if entry.amount_converted and entry.converted_currency_code == "KRW"
-                    else entry.amount if entry.currency_code == "KRW"
-                    else convert_to_krw(entry.amount, entry.currency_code)
-                )
+    @etag_by_data_version
+    def get(self, request):
+        user = request.user
+        groups = monthly_groups(user)
+        result = self._calculate_summary(user, groups)
+        serializer = ThisMonthSummarySerializer(result)
+        return ok("전체 수입/지출 합계 조회 성공", serializer.data)
 
-                total_krw += krw_amount
 
-                if foreign_currency == "KRW":
-                    total_foreign += krw_amount
-                else:
-                    if entry.amount_converted and entry.converted_currency_code == foreign_currency:
-                        total_foreign += safe_decimal(entry.amount_converted)
-                    else:
-                        total_foreign += safe_decimal(convert_from_krw(krw_amount, foreign_currency))
+# 기간별 수입/지출 추이
+# - ?from=YYYY-MM-DD&to=YYYY-MM-DD (양끝 포함, 최대 LEDGER_RANGE_MAX_DAYS일)
+# - ?group=day|week|month (기본 month, week는 월요일 시작)
+# - 항목이 없는 구간도 0으로 채워서 반환
+class RangeSummaryView(LedgerSummaryMixin, APIView):
+    permission_classes = [IsAuthenticated]
 
-            total_foreign = total_foreign.quantize(Decimal("0.01"))
-            total_krw = total_krw.quantize(Decimal("0.01"))
-            return total_foreign, total_krw
+    GROUPS = ("day", "week", "month")
 
-        income_foreign, income_krw = _sum(LedgerEntry.EntryType.INCOME)
-        expense_foreign, expense_krw = _sum(LedgerEntry.EntryType.EXPENSE)
+    @etag_by_data_version
+    def get(self, request):
+        params = request.query_params
+        group_by = params.get("group", "month")
+        if group_by not in self.GROUPS:
+            return bad("조회 실패", "group은 day, week, month 중 하나여야 합니다.", status=400)
+        try:
+            date_from = datetime.strptime(params.get("from", ""), "%Y-%m-%d").date()
+            date_to = datetime.strptime(params.get("to", ""), "%Y-%m-%d").date()
+        except ValueError:
+            return bad("조회 실패", "from, to는 YYYY-MM-DD 형식이어야 합니다.", status=400)
+        if date_from > date_to:
+            return bad("조회 실패", "from은 to보다 이후일 수 없습니다.", status=400)
+        if (date_to - date_from).days >= LEDGER_RANGE_MAX_DAYS:
+            return bad("조회 실패", f"기간은 최대 {LEDGER_RANGE_MAX_DAYS}일까지 조회할 수 있습니다.", status=400)
 
-        return {
-            "month": today.strftime("%Y-%m") if today else "전체 기간",
-            "foreign_currency": foreign_currency,
-            "income_foreign": income_foreign,
-            "income_krw": income_krw,
-            "expense_foreign": expense_foreign,
-            "expense_krw": expense_krw,
+        user = request.user
+        foreign_currency = self._foreign_currency(user)
+        buckets = range_groups(user, date_from, date_to, group_by)
+
+        series = []
+        total = {
+            key: Money.zero(foreign_currency if key.endswith("foreign") else "KRW")
+            for key in ("income_foreign", "income_krw", "expense_foreign", "expense_krw")
         }
+        start = bucket_start(date_from, group_by)
+        while start <= date_to:
+            end = _bucket_end(start, group_by)
+            result = self._calculate_summary(user, buckets.get(start, []), foreign_currency=foreign_currency)
+            for key, money in total.items():
+                total[key] = money + Money.from_decimal(result[key], money.currency)
+
+            result["period"] = start.strftime("%Y-%m") if group_by == "month" else start.isoformat()
+            result["start"] = max(start, date_from).isoformat()
+            result["end"] = min(end, date_to).isoformat()
+            series.append(result)
+            start = end + timedelta(days=1)
 
-    def _foreign_currency(self, user):
-        exchange_profile = getattr(user, "exchange_profile", None)
-        if not exchange_profile:
-            return "KRW"
+        payload = {
+            "from": date_from.isoformat(),
+            "to": date_to.isoformat(),
+            "group": group_by,
+            "foreign_currency": foreign_currency,
+            "series": series,
+            "total": {
+                "foreign_currency": foreign_currency,
+                **{key: money.to_decimal() for key, money in total.items()},
+            },
+        }
+        return ok("기간별 수입/지출 조회 성공", RangeSummarySerializer(payload).data)
 
-        country_name = getattr(exchange_profile, "exchange_country", None)
-        if not country_name:
-            return "KRW"
 
-        name = country_name.strip()
-        return COUNTRY_TO_CURRENCY.get(name, "KRW")
+def _bucket_end(start, group_by):
+    if group_by == "month":
+        return (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    if group_by == "week":
+        return start + timedelta(days=6)
+    return start
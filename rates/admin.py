@@ -8,3 +8,9 @@ class ExchangeRateAdmin(admin.ModelAdmin):
     search_fields = ["target_currency"]
     ordering      = ["id"]
 
+
+@admin.register(ExchangeRateHistory)
+class ExchangeRateHistoryAdmin(admin.ModelAdmin):
+    list_display  = ["id", "target_currency", "rate", "effective_at"]
+    list_filter   = ["target_currency"]
+    ordering      = ["-effective_at"]
@@ -1,35 +1,25 @@
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-
-import os
-import django
-
-# DJANGO_SETTINGS_MODULE만 바꿔서 로컬/배포 전환
-#   - 로컬: dongleDongle.settings.dev
-#   - 배포: dongleDongle.settings.prod
-# os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dongleDongle.settings.dev")
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dongleDongle.settings.prod")
-django.setup()
+import time
+from decimal import Decimal, ROUND_HALF_UP
 
-from django.conf import settings
 import requests
-import pymysql
-import schedule
-import time
-from datetime import datetime
-
-db = settings.DATABASES["default"]
-DB_CONFIG = {
-    "host": db.get("HOST") or "localhost",
-    "user": db.get("USER") or "root",
-    "password": db.get("PASSWORD") or "",
-    "database": db.get("NAME") or "dongle_db",
-    "charset": "utf8mb4",
-    # 필요하면 "port": int(db.get("PORT") or 3306),
-}
-
-# 환율 API 
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ExchangeRate, ExchangeRateHistory, RateGeneration
+from .signals import rates_updated
+from .provider import invalidate_rates
+
+"""
+    # 환율 갱신 로직 (manage.py update_rates 에서 호출)
+    1. 외부 API 호출 (timeout + 실패 시 지수 백오프 재시도)
+    2. 타겟 통화만 골라서 DB 저장 형식(소수 6자리)으로 맞춤
+    3. 저장된 값과 모두 같으면 쓰기 생략
+    4. 바뀐 경우 ExchangeRate 일괄 upsert + ExchangeRateHistory 추가 (한 트랜잭션)
+    5. 같은 트랜잭션에서 RateGeneration 증가 -> 커밋되는 순간 모든 워커가 다음 요청에서 새 환율 사용
+"""
+
+# 환율 API
 API_URL = getattr(settings, "EXCHANGE_API_URL", "https://open.er-api.com/v6/latest/KRW")
 
 # 타겟 통화
@@ -39,55 +29,78 @@ TARGET_CURRENCIES = getattr(
     ["USD", "JPY", "EUR", "CNY", "TWD", "CAD", "GBP", "KRW"],
 )
 
-def update_exchange_rates():
-    """외부 API에서 환율 불러와 MySQL에 저장/갱신"""
-    print(f"\n[{datetime.now()}] 환율 업데이트 시작")
-
-    try:
-        # 1. API 호출
-        response = requests.get(API_URL)
-        response.raise_for_status()
-        data = response.json()
-
-
-        base = data.get("base") or data.get("base_code") or "KRW"
-        rates = data.get("rates", {})
-
-        filtered_rates = {k: v for k, v in rates.items() if k in TARGET_CURRENCIES}
-
-        # 2. DB 연결
-        connection = pymysql.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-
-        # 3. 각 통화에 대해 INSERT OR UPDATE
-        for target, rate in filtered_rates.items():
-            sql = """
-                INSERT INTO rates_exchangerate (base_currency, target_currency, rate, updated_at)
-                VALUES (%s, %s, %s, NOW())
-                ON DUPLICATE KEY UPDATE 
-                    rate = VALUES(rate),
-                    updated_at = CURRENT_TIMESTAMP;
-            """
-            cursor.execute(sql, (base, target, rate))
-
-        # 4️. 커밋 & 종료
-        connection.commit()
-        cursor.close()
-        connection.close()
-
-        print(f"[{datetime.now()}] 환율 업데이트 완료 ({len(rates)}개 갱신)")
-
-    except Exception as e:
-        print(f"오류 발생: {e}")
-
-
-# 1시간마다 갱신 
-schedule.every(1).hours.do(update_exchange_rates)
-
-# 처음 한 번 즉시 실행
-update_exchange_rates()
-
-print("\n 1시간마다 환율 자동 갱신 중 \n")
-while True:
-    schedule.run_pending()
-    time.sleep(10)
\ No newline at end of file
+# API 요청 timeout(초) / 재시도 횟수 / 첫 재시도 대기(초, 이후 2배씩)
+API_TIMEOUT = getattr(settings, "EXCHANGE_API_TIMEOUT", 10)
+API_RETRIES = getattr(settings, "EXCHANGE_API_RETRIES", 3)
+API_BACKOFF = getattr(settings, "EXCHANGE_API_BACKOFF", 1)
+
+
+def fetch_rates(url=API_URL, timeout=API_TIMEOUT, retries=API_RETRIES, backoff=API_BACKOFF):
+    """외부 API에서 환율 응답(JSON)을 가져옴, 재시도까지 모두 실패하면 마지막 예외를 그대로 올림"""
+    for attempt in range(retries + 1):
+        try:
+            response = requests.get(url, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError):
+            if attempt == retries:
+                raise
+            time.sleep(backoff * (2 ** attempt))
+
+
+def parse_rates(data):
+    """API 응답에서 (기준 통화, {통화: 환율}) 추출, 환율은 DB와 같은 소수 6자리로 반올림"""
+    base = data.get("base") or data.get("base_code") or "KRW"
+    rates = data.get("rates", {})
+
+    filtered_rates = {}
+    for currency in TARGET_CURRENCIES:
+        if currency not in rates:
+            continue
+        filtered_rates[currency] = Decimal(str(rates[currency])).quantize(
+            Decimal("0.000001"), rounding=ROUND_HALF_UP
+        )
+    return base, filtered_rates
+
+
+def save_rates(base, filtered_rates):
+    """바뀐 환율만 upsert + 이력 추가, 바뀐 통화 목록 반환 (없으면 쓰기 없이 빈 목록)"""
+    current = dict(ExchangeRate.objects.values_list("target_currency", "rate"))
+    changed = {
+        currency: rate
+        for currency, rate in filtered_rates.items()
+        if current.get(currency) != rate
+    }
+    if not changed:
+        return []
+
+    now = timezone.now()
+    # MySQL은 ON DUPLICATE KEY UPDATE라 충돌 컬럼을 지정하지 않음 (SQLite/PostgreSQL은 지정 필요)
+    unique_fields = ["target_currency"] if connection.features.supports_update_conflicts_with_target else None
+
+    with transaction.atomic():
+        ExchangeRate.objects.bulk_create(
+            [
+                ExchangeRate(base_currency=base, target_currency=currency, rate=rate, updated_at=now)
+                for currency, rate in changed.items()
+            ],
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=["base_currency", "rate", "updated_at"],
+        )
+        ExchangeRateHistory.objects.bulk_create([
+            ExchangeRateHistory(base_currency=base, target_currency=currency, rate=rate, effective_at=now)
+            for currency, rate in changed.items()
+        ])
+        RateGeneration.bump()
+
+    invalidate_rates()
+    rates_updated.send(sender=ExchangeRate, currencies=sorted(changed))
+    return sorted(changed)
+
+
+def update_exchange_rates(url=API_URL, timeout=API_TIMEOUT, retries=API_RETRIES, backoff=API_BACKOFF):
+    """외부 API에서 환율 불러와 DB에 저장/갱신"""
+    data = fetch_rates(url, timeout=timeout, retries=retries, backoff=backoff)
+    base, filtered_rates = parse_rates(data)
+    return save_rates(base, filtered_rates)
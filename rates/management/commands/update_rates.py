@@ -0,0 +1,61 @@
+import time
+from datetime import datetime
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from rates.exchange_updater import (
+    API_BACKOFF,
+    API_RETRIES,
+    API_TIMEOUT,
+    API_URL,
+    update_exchange_rates,
+)
+
+
+class Command(BaseCommand):
+    help = "외부 API에서 환율을 불러와 ExchangeRate/ExchangeRateHistory에 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default=API_URL, help="환율 API 주소")
+        parser.add_argument("--timeout", type=float, default=API_TIMEOUT, help="요청 timeout(초)")
+        parser.add_argument("--retries", type=int, default=API_RETRIES, help="실패 시 재시도 횟수")
+        parser.add_argument("--backoff", type=float, default=API_BACKOFF, help="첫 재시도 대기(초), 이후 2배씩")
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="0보다 크면 종료하지 않고 해당 주기(초)마다 반복 실행 (cron 대신 상주 실행할 때)",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+        if interval <= 0:
+            if not self._run_once(options):
+                raise CommandError("환율 업데이트 실패")
+            return
+
+        while True:
+            self._run_once(options)
+            close_old_connections()
+            time.sleep(interval)
+
+    def _run_once(self, options):
+        self.stdout.write(f"[{datetime.now()}] 환율 업데이트 시작")
+        try:
+            changed = update_exchange_rates(
+                options["url"],
+                timeout=options["timeout"],
+                retries=options["retries"],
+                backoff=options["backoff"],
+            )
+        except (requests.RequestException, ValueError) as e:
+            self.stderr.write(f"오류 발생: {e}")
+            return False
+
+        if changed:
+            self.stdout.write(f"[{datetime.now()}] 환율 업데이트 완료 ({len(changed)}개 갱신: {', '.join(changed)})")
+        else:
+            self.stdout.write(f"[{datetime.now()}] 환율 변동 없음 (저장 생략)")
+        return True
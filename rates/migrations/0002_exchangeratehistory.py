@@ -0,0 +1,42 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:02
+
+from django.db import migrations, models
+
+
+# 현재 환율을 이력의 첫 값으로 복사
+def seed_history(apps, schema_editor):
+    ExchangeRate = apps.get_model("rates", "ExchangeRate")
+    ExchangeRateHistory = apps.get_model("rates", "ExchangeRateHistory")
+    ExchangeRateHistory.objects.bulk_create([
+        ExchangeRateHistory(
+            base_currency=rate.base_currency,
+            target_currency=rate.target_currency,
+            rate=rate.rate,
+            effective_at=rate.updated_at,
+        )
+        for rate in ExchangeRate.objects.all()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rates', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRateHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('base_currency', models.CharField(blank=True, max_length=10)),
+                ('target_currency', models.CharField(choices=[('KRW', '대한민국 원 (KRW)'), ('USD', '미국 달러 (USD)'), ('JPY', '일본 엔 (JPY)'), ('EUR', '유럽 유로 (EUR)'), ('CNY', '중국 위안 (CNY)'), ('TWD', '대만 달러 (TWD)'), ('GBP', '영국 파운드 (GBP)'), ('CAD', '캐나다 달러 (CAD)')], max_length=10)),
+                ('rate', models.DecimalField(decimal_places=6, max_digits=10)),
+                ('effective_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['target_currency', 'effective_at'], name='rates_excha_target__871cd0_idx')],
+            },
+        ),
+        migrations.RunPython(seed_history, migrations.RunPython.noop),
+    ]
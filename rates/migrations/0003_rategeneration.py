@@ -0,0 +1,28 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:04
+
+from django.db import migrations, models
+
+
+# 세대 번호 행 미리 생성
+def create_generation_row(apps, schema_editor):
+    RateGeneration = apps.get_model("rates", "RateGeneration")
+    RateGeneration.objects.get_or_create(pk=1, defaults={"generation": 0})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rates', '0002_exchangeratehistory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateGeneration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('generation', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_generation_row, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 # Create your models here.
 
 #통화 옵션
@@ -20,3 +22,37 @@ class ExchangeRate(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     
+
+#환율 이력 모델 (추가만 하고 수정하지 않음 -> 과거 시점 환율 재계산용)
+class ExchangeRateHistory(models.Model):
+    base_currency = models.CharField(max_length = 10, blank = True)
+    target_currency = models.CharField(max_length = 10, choices=CurrencyOption.choices)
+    rate = models.DecimalField(max_digits = 10, decimal_places = 6)
+    effective_at = models.DateTimeField() #이 시점부터 적용된 환율
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["target_currency", "effective_at"]),
+        ]
+
+
+#환율 세대 번호 (1행만 사용) -> 환율이 바뀔 때마다 1 증가
+#각 gunicorn 워커는 요청마다 이 값만 확인해서 자기 환율 캐시가 오래됐는지 판단
+class RateGeneration(models.Model):
+    generation = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    ROW_ID = 1
+
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(pk=cls.ROW_ID).values_list("generation", flat=True).first() or 0
+
+    @classmethod
+    def bump(cls):
+        updated = cls.objects.filter(pk=cls.ROW_ID).update(
+            generation=F("generation") + 1,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            cls.objects.get_or_create(pk=cls.ROW_ID, defaults={"generation": 1})
@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+"""
+    # 금액 값 타입 (합산 루프 전용)
+    - 금액을 최소 단위 정수(0.01 단위, minor)와 통화 코드로 보관
+    - 합산은 정수 덧셈만 하고, 직렬화 직전에 to_decimal()로 Decimal 복원
+    - 소수 둘째 자리까지인 값만 받음 (DB 금액 필드, 환산 결과 모두 0.01 단위)
+      -> Decimal 합산 후 quantize 한 결과와 항상 같음
+"""
+
+CENT = Decimal("0.01")
+
+
+class Money:
+    __slots__ = ("minor", "currency")
+
+    def __init__(self, minor, currency):
+        self.minor = minor
+        self.currency = currency
+
+    @classmethod
+    def zero(cls, currency):
+        return cls(0, currency)
+
+    @classmethod
+    def from_decimal(cls, value, currency):
+        scaled = Decimal(value) * 100
+        minor = int(scaled)
+        if minor != scaled:
+            raise ValueError(f"0.01 단위가 아닌 금액입니다: {value}")
+        return cls(minor, currency)
+
+    def to_decimal(self):
+        return (Decimal(self.minor) / 100).quantize(CENT)
+
+    def _check(self, other):
+        if self.currency != other.currency:
+            raise ValueError(f"통화가 다른 금액끼리 계산할 수 없습니다: {self.currency}, {other.currency}")
+
+    def __add__(self, other):
+        self._check(other)
+        return Money(self.minor + other.minor, self.currency)
+
+    def __sub__(self, other):
+        self._check(other)
+        return Money(self.minor - other.minor, self.currency)
+
+    def __neg__(self):
+        return Money(-self.minor, self.currency)
+
+    def __bool__(self):
+        return self.minor != 0
+
+    def __eq__(self, other):
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.minor == other.minor and self.currency == other.currency
+
+    def __hash__(self):
+        return hash((self.minor, self.currency))
+
+    def __repr__(self):
+        return f"Money({self.to_decimal()} {self.currency})"
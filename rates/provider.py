@@ -0,0 +1,208 @@
+import threading
+import time
+from bisect import bisect_right
+
+from django.conf import settings
+from django.db.models import Max
+
+from .models import ExchangeRate, ExchangeRateHistory, RateGeneration
+
+"""
+    # 프로세스 단위 환율 테이블
+    - CurrencyOption 8개 통화 환율을 한 번에 읽어서 메모리에 보관
+    - version: 가장 최신 updated_at (환율이 바뀌었는지 판단하는 기준)
+    - generation: RateGeneration 세대 번호 (환율 갱신 시 1 증가, 워커 간 무효화 신호)
+    - 요청이 시작되면 stale 표시만 해두고, 그 요청의 첫 환산에서 generation 1행만 확인
+      -> 다른 워커가 환율을 갱신했어도 다음 요청에서 바로 반영
+    - 요청 밖(커맨드/워커)에서는 ttl마다 확인
+    - ttl이 지나면 version도 비교 (세대 번호 없이 직접 수정된 경우 대비)
+    - 환율 이력은 통화별로 처음 rate_at이 불릴 때 그 통화만 읽어서 (시점 목록, 환율 목록)으로 정렬해 두고
+      bisect로 과거 환율 조회 (이력 전체를 한 번에 읽지 않음, 환율이 다시 로드되면 비움)
+    - 외화 <-> 외화 교차 환율(N×N)은 환율이 다시 로드될 때만 새로 계산
+"""
+
+# 환율 캐시 유지 시간(초)
+RATE_CACHE_TTL = getattr(settings, "EXCHANGE_RATE_CACHE_TTL", 60)
+
+
+class RateTable:
+    def __init__(self, ttl=RATE_CACHE_TTL):
+        self.ttl = ttl
+        self.rates = {}
+        self.history = {}
+        self.cross = None
+        self.version = None
+        self.generation = None
+        self.verified_at = None
+        self.stale = False
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    # 통화 하나의 환율 (1 KRW = rate 외화), 없으면 None
+    def get(self, currency):
+        self._ensure_fresh()
+        return self.rates.get(currency)
+
+    # when 시점에 적용되던 환율, 이력이 없거나 첫 이력보다 이전이면 None
+    def rate_at(self, currency, when):
+        self._ensure_fresh()
+        history = self.history
+        series = history.get(currency)
+        if series is None:
+            series = self._load_history(currency)
+            history[currency] = series
+        if not series[0]:
+            return None
+        times, rates = series
+        index = bisect_right(times, when) - 1
+        if index < 0:
+            return None
+        return rates[index]
+
+    # 1 from_currency = rate to_currency (KRW 기준 환율로 계산한 교차 환율), 없으면 None
+    def cross_rate(self, from_currency, to_currency):
+        self._ensure_fresh()
+        cross = self.cross
+        if cross is None:
+            cross = self._build_cross(self.rates)
+            self.cross = cross
+        return cross.get((from_currency, to_currency))
+
+    # 전체 환율 dict (로드 시마다 새 dict로 교체되므로 그대로 읽기만 할 것)
+    def snapshot(self):
+        self._ensure_fresh()
+        return self.rates
+
+    # 다음 조회 때 세대 번호를 확인하도록 표시 (요청 시작마다 호출, DB 접근 없음)
+    def mark_stale(self):
+        self.stale = True
+
+    def invalidate(self):
+        with self._lock:
+            self.verified_at = None
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "version": self.version,
+            "generation": self.generation,
+            "currencies": len(self.rates),
+            "history_points": sum(len(times) for times, _ in self.history.values()),
+        }
+
+    def _ensure_fresh(self):
+        if self._is_fresh():
+            self.hits += 1
+            return
+
+        with self._lock:
+            # 다른 스레드가 먼저 확인했으면 그대로 사용
+            if self._is_fresh():
+                self.hits += 1
+                return
+
+            self.stale = False
+            if self.verified_at is None:
+                self._load()
+                self.misses += 1
+                return
+
+            expired = time.monotonic() - self.verified_at >= self.ttl
+            generation = self._current_generation()
+            changed = generation != self.generation
+            if not changed and expired:
+                changed = self._current_version() != self.version
+
+            if changed:
+                self._load(generation)
+                self.misses += 1
+            else:
+                self.hits += 1
+                if expired:
+                    self.verified_at = time.monotonic()
+
+    def _is_fresh(self):
+        verified_at = self.verified_at
+        return verified_at is not None and not self.stale and time.monotonic() - verified_at < self.ttl
+
+    @staticmethod
+    def _build_cross(rates):
+        # 1 KRW = rate_a A = rate_b B  ->  1 A = rate_b / rate_a B
+        return {
+            (a, b): rate_b / rate_a
+            for a, rate_a in rates.items() if rate_a
+            for b, rate_b in rates.items()
+        }
+
+    def _current_generation(self):
+        return RateGeneration.current()
+
+    def _current_version(self):
+        return ExchangeRate.objects.aggregate(version=Max("updated_at"))["version"]
+
+    def _load(self, generation=None):
+        if generation is None:
+            generation = self._current_generation()
+        rates = {}
+        version = None
+        # 통화별 중복 데이터가 있더라도 최신 것이 남도록 updated_at 오름차순
+        rows = ExchangeRate.objects.order_by("updated_at").values_list("target_currency", "rate", "updated_at")
+        for currency, rate, updated_at in rows:
+            rates[currency] = rate
+            if version is None or updated_at > version:
+                version = updated_at
+
+        self.rates = rates
+        self.history = {}
+        self.cross = None
+        self.version = version
+        self.generation = generation
+        self.verified_at = time.monotonic()
+
+
+    @staticmethod
+    def _load_history(currency):
+        times, values = [], []
+        rows = (
+            ExchangeRateHistory.objects
+            .filter(target_currency=currency)
+            .order_by("effective_at")
+            .values_list("effective_at", "rate")
+        )
+        for effective_at, rate in rows:
+            times.append(effective_at)
+            values.append(rate)
+        return times, values
+
+
+rate_table = RateTable()
+
+
+def get_rate(currency):
+    return rate_table.get(currency)
+
+
+def get_rate_at(currency, when):
+    return rate_table.rate_at(currency, when)
+
+
+def get_cross_rate(from_currency, to_currency):
+    return rate_table.cross_rate(from_currency, to_currency)
+
+
+def get_rates():
+    return rate_table.snapshot()
+
+
+def mark_rates_stale():
+    rate_table.mark_stale()
+
+
+def invalidate_rates():
+    rate_table.invalidate()
+
+
+def rate_cache_stats():
+    return rate_table.stats()
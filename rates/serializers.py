@@ -5,5 +5,24 @@ from .models import *
 class ConvertResultSerializer(serializers.Serializer):
     from_currency = serializers.CharField()
     to_currency = serializers.CharField()
-    amount = serializers.DecimalField(max_digits=10, decimal_places=2)
-    converted = serializers.DecimalField(max_digits=10, decimal_places=2)
+    # 일괄 변환 입력(최대 20자리)을 그대로 담을 수 있게, 환산값은 환율만큼 커질 수 있으므로 여유 있게
+    amount = serializers.DecimalField(max_digits=20, decimal_places=2)
+    converted = serializers.DecimalField(max_digits=30, decimal_places=2)
+
+
+#일괄 변환 요청 항목 serializer ({"from": ..., "to": ..., "amount": ...})
+class ConvertItemSerializer(serializers.Serializer):
+    from_currency = serializers.CharField(max_length=10)
+    to = serializers.CharField(max_length=10)
+    amount = serializers.DecimalField(max_digits=20, decimal_places=6)
+
+    # "from"은 파이썬 예약어라 선언만 from_currency로 하고 요청 키는 "from" 사용
+    def get_fields(self):
+        fields = super().get_fields()
+        fields["from"] = fields.pop("from_currency")
+        return fields
+
+
+#일괄 변환 요청 serializer
+class ConvertBatchSerializer(serializers.Serializer):
+    items = ConvertItemSerializer(many=True, allow_empty=False, max_length=500)
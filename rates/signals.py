@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from django.core.signals import request_started
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .models import ExchangeRate, ExchangeRateHistory, RateGeneration
+from .provider import invalidate_rates, mark_rates_stale
+
+# 환율이 바뀐 뒤 보내는 시그널 (currencies: 바뀐 통화 코드 목록) -> 환율로 계산해 둔 값 갱신에 사용
+rates_updated = Signal()
+
+
+# 요청마다 환율 캐시를 stale 표시 -> 첫 환산 때 세대 번호 1행만 확인
+@receiver(request_started)
+def mark_rate_cache_stale(sender, **kwargs):
+    mark_rates_stale()
+
+
+def _notify(instance):
+    RateGeneration.bump()
+    invalidate_rates()
+    rates_updated.send(sender=ExchangeRate, currencies=[instance.target_currency])
+
+
+# admin/ORM에서 환율을 직접 수정한 경우에도 이력을 남기고 다른 워커에 알림
+# (save_rates는 bulk_create라 이 시그널이 오지 않고 이력도 직접 추가함)
+@receiver(post_save, sender=ExchangeRate)
+def record_rate_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        latest = (
+            ExchangeRateHistory.objects
+            .filter(target_currency=instance.target_currency)
+            .order_by("-effective_at")
+            .values_list("rate", flat=True)
+            .first()
+        )
+        if latest != Decimal(str(instance.rate)):
+            ExchangeRateHistory.objects.create(
+                base_currency=instance.base_currency,
+                target_currency=instance.target_currency,
+                rate=instance.rate,
+                effective_at=instance.updated_at,
+            )
+    _notify(instance)
+
+
+@receiver(post_delete, sender=ExchangeRate)
+def bump_rate_generation(sender, instance, **kwargs):
+    _notify(instance)
@@ -1,3 +1,39 @@
+from datetime import timedelta
+from decimal import Decimal
+
 from django.test import TestCase
+from django.utils import timezone
+
+from .models import ExchangeRate, ExchangeRateHistory
+from .provider import get_rate, get_rate_at, invalidate_rates, rate_table
+
+
+# 환율 이력: admin/ORM 저장도 이력을 남기고, 과거 환율은 통화별로 필요할 때만 읽음
+class RateHistoryTests(TestCase):
+    def setUp(self):
+        self.usd = ExchangeRate.objects.create(base_currency="KRW", target_currency="USD", rate=Decimal("0.000721"))
+        ExchangeRate.objects.create(base_currency="KRW", target_currency="JPY", rate=Decimal("0.107312"))
+        invalidate_rates()
+
+    def test_orm_save_appends_history(self):
+        before = timezone.now()
+        self.usd.rate = Decimal("0.000700")
+        self.usd.save()
+        # 같은 환율로 다시 저장하면 이력을 늘리지 않음
+        self.usd.save()
+
+        rates = list(ExchangeRateHistory.objects.filter(target_currency="USD").values_list("rate", flat=True))
+        self.assertEqual(rates, [Decimal("0.000721"), Decimal("0.000700")])
+        self.assertEqual(get_rate_at("USD", timezone.now()), Decimal("0.000700"))
+        self.assertIsNone(get_rate_at("USD", before - timedelta(days=1)))
+
+    def test_history_is_loaded_per_currency_on_first_use(self):
+        self.assertEqual(get_rate("USD"), Decimal("0.000721"))
+        self.assertEqual(rate_table.stats()["history_points"], 0)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_rate_at("USD", timezone.now()), Decimal("0.000721"))
+        self.assertEqual(set(rate_table.history), {"USD"})
 
-# Create your tests here.
+        with self.assertNumQueries(0):
+            get_rate_at("USD", timezone.now())
@@ -1,28 +1,128 @@
 from decimal import Decimal, ROUND_HALF_UP
-from .models import *
-from django.core.exceptions import ObjectDoesNotExist
-from rest_framework.views import APIView
-from rest_framework import permissions
-from .serializers import *
-from rest_framework.response import Response
+from .provider import get_cross_rate, get_rate, get_rate_at, get_rates
 
-# 예산안용 함수 저장 파일 
+# 예산안/가계부 공용 환율 변환 함수 저장 파일
+# 환율은 provider의 프로세스 캐시에서 읽으므로 변환마다 쿼리가 나가지 않음
 
-# 1) 외화 -> 한화 
+# 1) 외화 -> 한화
+# 1외화 = 1/rate KRW
 def convert_to_krw(amount, from_currency):
-    try:
-        krw_to_foreign = ExchangeRate.objects.get(target_currency=from_currency).rate
-        converted = Decimal(amount) / Decimal(krw_to_foreign)
-        return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    except ObjectDoesNotExist:
+    krw_to_foreign = get_rate(from_currency)
+    if krw_to_foreign is None:
         return None
-    
+    converted = Decimal(amount) / Decimal(krw_to_foreign)
+    return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
 
 #2) 한화 -> 외화
 def convert_from_krw(amount, to_currency):
-    try:
-        krw_to_foreign = ExchangeRate.objects.get(target_currency=to_currency).rate
-        converted = Decimal(amount) * Decimal(krw_to_foreign)
-        return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    except ObjectDoesNotExist:
-        return None
\ No newline at end of file
+    krw_to_foreign = get_rate(to_currency)
+    if krw_to_foreign is None:
+        return None
+    converted = Decimal(amount) * Decimal(krw_to_foreign)
+    return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+#3) 임의 통화 -> 임의 통화
+# KRW가 끼어 있으면 1), 2)와 같은 계산, 외화끼리는 교차 환율 사용
+def convert_between(amount, from_currency, to_currency):
+    if from_currency == to_currency:
+        return Decimal(amount).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    if to_currency == "KRW":
+        return convert_to_krw(amount, from_currency)
+    if from_currency == "KRW":
+        return convert_from_krw(amount, to_currency)
+
+    cross_rate = get_cross_rate(from_currency, to_currency)
+    if cross_rate is None:
+        return None
+    converted = Decimal(amount) * cross_rate
+    return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+"""
+    # 여러 금액 일괄 변환
+    pairs: (금액, 통화) 목록
+    - 통화별로 묶어서 환율은 그룹당 한 번만 조회
+    - 항목별 결과는 단건 변환과 같은 ROUND_HALF_UP 0.01 반올림
+    - KRW -> KRW 처럼 같은 통화끼리는 환율 없이 반올림만 적용
+    - 환율이 없는 통화의 항목/합계는 None
+"""
+class BatchConversion:
+    __slots__ = ("items", "totals")
+
+    def __init__(self, items, totals):
+        self.items = items    # 입력 순서 그대로의 변환 결과 목록
+        self.totals = totals  # {원본 통화: 변환 결과 합계}
+
+    # 환율이 있는 그룹만 더한 전체 합계
+    @property
+    def total(self):
+        return sum((t for t in self.totals.values() if t is not None), Decimal("0.00"))
+
+
+def _convert_many(pairs, apply):
+    pairs = list(pairs)
+    items = [None] * len(pairs)
+
+    groups = {}
+    for index, (amount, currency) in enumerate(pairs):
+        groups.setdefault(currency, []).append((index, amount))
+
+    rates = get_rates()
+    totals = {}
+    for currency, members in groups.items():
+        rate = None
+        if currency != "KRW":
+            rate = rates.get(currency)
+            if rate is None:
+                totals[currency] = None
+                continue
+            rate = Decimal(rate)
+
+        total = Decimal("0.00")
+        for index, amount in members:
+            value = Decimal(amount) if rate is None else apply(Decimal(amount), rate)
+            converted = value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+            items[index] = converted
+            total += converted
+        totals[currency] = total
+
+    return BatchConversion(items, totals)
+
+
+# 4) 외화 목록 -> 한화
+def convert_many_to_krw(pairs):
+    return _convert_many(pairs, lambda amount, rate: amount / rate)
+
+
+# 5) 한화 목록 -> 외화 (pairs: (한화 금액, 변환할 통화))
+def convert_many_from_krw(pairs):
+    return _convert_many(pairs, lambda amount, rate: amount * rate)
+
+
+# 6) 등록 시점 환율로 외화 목록 -> 한화 (triples: (금액, 통화, 시점))
+# 해당 시점 이력이 없으면 현재 환율 사용
+def convert_many_to_krw_at(triples):
+    triples = list(triples)
+    rates = get_rates()
+
+    items = [None] * len(triples)
+    totals = {}
+    for index, (amount, currency, when) in enumerate(triples):
+        if currency == "KRW":
+            value = Decimal(amount)
+        else:
+            rate = get_rate_at(currency, when) if when is not None else None
+            if rate is None:
+                rate = rates.get(currency)
+            if rate is None:
+                totals.setdefault(currency, None)
+                continue
+            value = Decimal(amount) / Decimal(rate)
+
+        converted = value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        items[index] = converted
+        totals[currency] = (totals.get(currency) or Decimal("0.00")) + converted
+
+    return BatchConversion(items, totals)
@@ -1,11 +1,10 @@
 from django.shortcuts import render
 from .models import *
-from decimal import Decimal, ROUND_HALF_UP
-from django.core.exceptions import ObjectDoesNotExist
 from rest_framework.views import APIView
 from rest_framework import permissions
 from .serializers import *
 from rest_framework.response import Response
+from .utils import convert_to_krw, convert_from_krw, convert_between
 # Create your views here.
 
 """
@@ -16,36 +15,11 @@ from rest_framework.response import Response
     to_currency: 변환 통화 
     만약 from = 외화면 무조건 KRW로 변환
     KRW 입력이면 to에 맞춰서 변환 
+    외화 -> 외화는 KRW 기준 환율로 만든 교차 환율로 변환
 """
 
-# 1) 외화 -> 한화 
-# 1외화 = 1/rate KRW
-def convert_to_krw(amount, from_currency):
-    try:
-        # 중복된 환율 데이터 중 최신 것만 사용하도록
-        rate_obj = (ExchangeRate.objects.filter(target_currency=from_currency).order_by("-updated_at").first())
-        if not rate_obj:
-            return None
-
-        krw_to_foreign = rate_obj.rate
-        converted = Decimal(amount) / Decimal(krw_to_foreign)
-        return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    except ObjectDoesNotExist:
-        return None
-    
-#2) 한화 -> 외화
-def convert_from_krw(amount, to_currency):
-    try:
-        # 중복된 환율 데이터 중 최신 것만 사용하도록
-        rate_obj = (ExchangeRate.objects.filter(target_currency=to_currency).order_by("-updated_at").first())
-        if not rate_obj:
-            return None
-
-        krw_to_foreign = rate_obj.rate
-        converted = Decimal(amount) * Decimal(krw_to_foreign)
-        return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    except ObjectDoesNotExist:
-        return None
+# 1) 외화 -> 한화, 2) 한화 -> 외화
+# rates.utils 구현을 그대로 사용 (환율은 rates.provider의 프로세스 캐시에서 읽음)
 
 #3) 하나의 엔드포인트
 class ConvertView(APIView):
@@ -56,11 +30,8 @@ class ConvertView(APIView):
         to_currency = request.GET.get("to", "").upper()
         amount = float(request.GET.get("amount", 0))
 
-        if to_currency == "KRW":
-            result = convert_to_krw(amount, from_currency)
-        elif from_currency == "KRW":
-            result = convert_from_krw(amount, to_currency)
-        
+        result = convert_between(amount, from_currency, to_currency)
+
         if result is None:
             return Response({"error: Rate not Found"}, status=404)
 
@@ -72,6 +43,27 @@ class ConvertView(APIView):
         })
         return Response(serializers.data)
 
+    # 일괄 변환: {"items": [{"from": "USD", "to": "JPY", "amount": 10}, ...]}
+    # 환율은 프로세스 캐시 한 번으로 모두 처리, 외화끼리는 교차 환율 사용
+    # 환율이 없는 항목은 converted가 null
+    def post(self, request):
+        serializer = ConvertBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        results = []
+        for item in serializer.validated_data["items"]:
+            from_currency = item["from"].upper()
+            to_currency = item["to"].upper()
+            results.append({
+                "from_currency": from_currency,
+                "to_currency": to_currency,
+                "amount": item["amount"],
+                "converted": convert_between(item["amount"], from_currency, to_currency),
+            })
+
+        return Response({"results": ConvertResultSerializer(results, many=True).data})
+
 # 200 테스트용
 class AlwaysOkView(APIView):
     def get(self, request):
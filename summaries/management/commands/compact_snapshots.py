@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from summaries.tasks import compact_snapshots, superseded_snapshots
+
+
+class Command(BaseCommand):
+    help = "사용자별 최신 스냅샷과 스크랩/좋아요가 있는 스냅샷만 남기고 나머지 SummarySnapshot을 배치로 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="DELETE 한 번에 지우는 행 수")
+        parser.add_argument("--dry-run", action="store_true", help="삭제하지 않고 대상 행 수만 출력")
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            self.stdout.write(f"삭제 대상 스냅샷 {superseded_snapshots().count()}행")
+            return
+        deleted = compact_snapshots(options["batch_size"])
+        self.stdout.write(f"스냅샷 정리 완료 ({deleted}행)")
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:25
+
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+
+CONTENT_FIELDS = (
+    "exchange_profile_id",
+    "detail_profile_id",
+    "snapshot_nickname",
+    "snapshot_gender",
+    "snapshot_exchange_country",
+    "snapshot_exchange_university",
+    "snapshot_exchange_type",
+    "snapshot_exchange_semester",
+    "snapshot_exchange_period",
+    "living_expense_foreign_amount",
+    "living_expense_foreign_currency",
+    "living_expense_krw_amount",
+    "living_expense_krw_currency",
+    "base_dispatch_foreign_amount",
+    "base_dispatch_krw_amount",
+)
+
+
+# 기존 스냅샷에도 SummarySnapshot.compute_content_hash와 같은 해시를 채움 (id 순으로 나눠서)
+def fill_content_hash(apps, schema_editor):
+    SummarySnapshot = apps.get_model("summaries", "SummarySnapshot")
+    chunk_size = 1000
+    last_id = 0
+    while True:
+        snapshots = list(SummarySnapshot.objects.filter(id__gt=last_id).order_by("id")[:chunk_size])
+        if not snapshots:
+            break
+        for snapshot in snapshots:
+            content = {field: getattr(snapshot, field) for field in CONTENT_FIELDS}
+            raw = json.dumps(content, sort_keys=True, cls=DjangoJSONEncoder, ensure_ascii=False)
+            snapshot.content_hash = hashlib.sha256(raw.encode()).hexdigest()
+        SummarySnapshot.objects.bulk_update(snapshots, ["content_hash"])
+        last_id = snapshots[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summaries', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='summarysnapshot',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(fill_content_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:26
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+# 사용자별 가장 큰 id의 스냅샷에 is_latest 표시 (피드 목록이 쓰던 Max("id")와 같은 기준)
+def fill_is_latest(apps, schema_editor):
+    SummarySnapshot = apps.get_model("summaries", "SummarySnapshot")
+    latest_ids = list(
+        SummarySnapshot.objects
+        .values("user")
+        .annotate(latest_id=Max("id"))
+        .values_list("latest_id", flat=True)
+    )
+    chunk_size = 1000
+    for start in range(0, len(latest_ids), chunk_size):
+        SummarySnapshot.objects.filter(id__in=latest_ids[start:start + chunk_size]).update(is_latest=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summaries', '0002_summarysnapshot_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='summarysnapshot',
+            name='is_latest',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(fill_is_latest, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='summarysnapshot',
+            index=models.Index(fields=['is_latest', 'created_at'], name='snapshot_latest_created_idx'),
+        ),
+    ]
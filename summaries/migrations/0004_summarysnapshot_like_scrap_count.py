@@ -0,0 +1,40 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:28
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# 기존 좋아요/스크랩 행 수로 카운터 채움 (행이 있는 스냅샷만)
+def fill_counts(apps, schema_editor):
+    SummarySnapshot = apps.get_model("summaries", "SummarySnapshot")
+    for model_name, field in (("FeedFavorite", "like_count"), ("FeedScrap", "scrap_count")):
+        model = apps.get_model("feeds", model_name)
+        counts = model.objects.values("snapshot_id").annotate(count=Count("id")).values_list("snapshot_id", "count")
+        for snapshot_id, count in counts:
+            SummarySnapshot.objects.filter(pk=snapshot_id).update(**{field: count})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0001_initial'),
+        ('summaries', '0003_summarysnapshot_is_latest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='summarysnapshot',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='summarysnapshot',
+            name='scrap_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='summarysnapshot',
+            index=models.Index(fields=['is_latest', 'scrap_count'], name='snapshot_latest_scrap_idx'),
+        ),
+    ]
@@ -1,7 +1,10 @@
 # summaries/models.py
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from decimal import Decimal
+import hashlib
+import json
 
 
 class DetailProfile(models.Model):
@@ -60,7 +63,47 @@ class SummarySnapshot(models.Model):
     base_dispatch_foreign_amount = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
     base_dispatch_krw_amount = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
 
+    # 화면에 보이는 내용(CONTENT_FIELDS)의 해시 -> 직전 스냅샷과 같으면 새로 저장하지 않음
+    content_hash = models.CharField(max_length=64, blank=True, default="")
+    # 사용자별 가장 최근 스냅샷 표시 (피드 목록은 이 값이 True인 행만 조회)
+    is_latest = models.BooleanField(default=False)
+
+    # 좋아요/스크랩 수 (FeedFavorite/FeedScrap 추가·삭제와 같은 트랜잭션에서 F()로 증감, manage.py reconcile_feed_counters로 보정)
+    like_count = models.PositiveIntegerField(default=0)
+    scrap_count = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_latest", "created_at"], name="snapshot_latest_created_idx"),
+            models.Index(fields=["is_latest", "scrap_count"], name="snapshot_latest_scrap_idx"),
+        ]
+
+    CONTENT_FIELDS = (
+        "exchange_profile_id",
+        "detail_profile_id",
+        "snapshot_nickname",
+        "snapshot_gender",
+        "snapshot_exchange_country",
+        "snapshot_exchange_university",
+        "snapshot_exchange_type",
+        "snapshot_exchange_semester",
+        "snapshot_exchange_period",
+        "living_expense_foreign_amount",
+        "living_expense_foreign_currency",
+        "living_expense_krw_amount",
+        "living_expense_krw_currency",
+        "base_dispatch_foreign_amount",
+        "base_dispatch_krw_amount",
+    )
+
+    @classmethod
+    def compute_content_hash(cls, values):
+        """values: CONTENT_FIELDS를 키로 가진 dict (없는 키는 None)"""
+        content = {field: values.get(field) for field in cls.CONTENT_FIELDS}
+        raw = json.dumps(content, sort_keys=True, cls=DjangoJSONEncoder, ensure_ascii=False)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
     def __str__(self):
         return f"{self.user} 가계부 요약본 ({self.created_at.date()})"
\ No newline at end of file
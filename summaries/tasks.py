@@ -0,0 +1,120 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from accounts.models import User
+from feeds.cards import refresh_feed_card
+from feeds.models import FeedFavorite, FeedScrap
+from ledgers.aggregates import convert_groups, monthly_groups
+from ledgers.models import LedgerEntry
+from rates.money import Money
+
+from .models import DetailProfile, SummarySnapshot
+from .views import INCLUDED_CATEGORIES, extract_months, resolve_foreign_currency
+
+"""
+    # 가계부 요약본 작업 (jobs 워커에서 실행)
+    - create_snapshot: 세부 프로필 저장 후 등록되는 스냅샷 생성 작업
+    - compact_snapshots: 최신이 아니고 스크랩/좋아요도 없는 스냅샷 정리 (manage.py compact_snapshots)
+"""
+
+
+@transaction.atomic
+def create_snapshot(user_id, detail_profile_id):
+    # 같은 사용자의 스냅샷 작업이 동시에 돌아도 is_latest가 한 행만 남도록 사용자 행 잠금
+    if User.objects.select_for_update().filter(pk=user_id).values_list("pk", flat=True).first() is None:
+        # 작업이 실행되기 전에 탈퇴한 경우
+        return None
+    user = User.objects.select_related("exchange_profile__exchange_univ").get(pk=user_id)
+    detail_profile = DetailProfile.objects.filter(pk=detail_profile_id).first()
+    snapshot = build_snapshot(user, detail_profile)
+    # 피드 목록에 쓰는 작성자 카드도 함께 계산
+    refresh_feed_card(user_id)
+    return snapshot.id
+
+
+def _sum_ledger_for_user(user, foreign_currency):
+    total_foreign = Money.zero(foreign_currency)
+    total_krw = Money.zero("KRW")
+
+    # 월별 합계에서 통화별 전체 기간 합계를 가져와 그룹마다 등록 당시 원화/외화로 환산
+    groups = monthly_groups(user, entry_type=LedgerEntry.EntryType.EXPENSE, categories=INCLUDED_CATEGORIES)
+    for group in convert_groups(groups, foreign_currency):
+        if group["entry_krw"] is None:
+            continue
+        total_krw += Money.from_decimal(group["entry_krw"], "KRW")
+        if group["entry_foreign"] is not None:
+            total_foreign += Money.from_decimal(group["entry_foreign"], foreign_currency)
+
+    return total_foreign.to_decimal(), total_krw.to_decimal()
+
+
+def build_snapshot(user, detail_profile):
+    exchange_profile = getattr(user, "exchange_profile", None)
+
+    foreign_currency = resolve_foreign_currency(exchange_profile)
+    total_foreign, total_krw = _sum_ledger_for_user(user, foreign_currency)
+
+    months = extract_months(exchange_profile)
+
+    monthly_foreign = (total_foreign / months).quantize(Decimal("0.01"))
+    monthly_krw = (total_krw / months).quantize(Decimal("0.01"))
+
+    values = dict(
+        exchange_profile_id=getattr(exchange_profile, "id", None),
+        detail_profile_id=getattr(detail_profile, "id", None),
+        snapshot_nickname=getattr(user, "nickname", "") or "",
+        snapshot_gender=user.get_gender_display() if hasattr(user, "get_gender_display") else "",
+        snapshot_exchange_country=getattr(exchange_profile, "exchange_country", "") or "",
+        snapshot_exchange_university=getattr(getattr(exchange_profile, "exchange_univ", None), "univ_name", "") or "",
+        snapshot_exchange_type=(
+            exchange_profile.get_exchange_type_display()
+            if exchange_profile and exchange_profile.exchange_type
+            else ""
+        ),
+        snapshot_exchange_semester=getattr(exchange_profile, "exchange_semester", "") or "",
+        snapshot_exchange_period=getattr(exchange_profile, "exchange_period", "") or "",
+        living_expense_foreign_amount=monthly_foreign,
+        living_expense_foreign_currency=foreign_currency,
+        living_expense_krw_amount=monthly_krw,
+        living_expense_krw_currency="KRW",
+    )
+    content_hash = SummarySnapshot.compute_content_hash(values)
+
+    # 보이는 내용이 직전 스냅샷과 같으면 새 행을 만들지 않고 직전 스냅샷 반환
+    latest = SummarySnapshot.objects.filter(user=user, is_latest=True).first()
+    if latest is not None and latest.content_hash == content_hash:
+        return latest
+
+    with transaction.atomic():
+        SummarySnapshot.objects.filter(user=user, is_latest=True).update(is_latest=False)
+        return SummarySnapshot.objects.create(user=user, content_hash=content_hash, is_latest=True, **values)
+
+
+def superseded_snapshots():
+    """사용자별 최신 스냅샷이 아니고, 스크랩/좋아요가 없는 스냅샷"""
+    return SummarySnapshot.objects.filter(
+        ~Exists(FeedScrap.objects.filter(snapshot=OuterRef("pk"))),
+        ~Exists(FeedFavorite.objects.filter(snapshot=OuterRef("pk"))),
+        is_latest=False,
+    )
+
+
+def compact_snapshots(batch_size=500):
+    """superseded_snapshots를 id 순으로 배치 삭제, 삭제한 행 수 반환"""
+    deleted = 0
+    last_id = 0
+    while True:
+        ids = list(
+            superseded_snapshots()
+            .filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        # 조회 후 그 사이에 스크랩/좋아요가 생긴 행은 조건을 다시 확인해서 제외
+        _, per_model = superseded_snapshots().filter(pk__in=ids).delete()
+        deleted += per_model.get(SummarySnapshot._meta.label, 0)
+        last_id = ids[-1]
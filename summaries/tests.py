@@ -1,3 +1,126 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import ExchangeProfile, User
+from feeds.models import FeedFavorite
+from rates.models import ExchangeRate
+from rates.provider import invalidate_rates
+
+from .models import DetailProfile, SummarySnapshot
+from .tasks import compact_snapshots
+
+
+# 가계부 요약본: 월별 합계(카테고리 x 통화)만 읽고 원장 항목 수와 무관한 비용이어야 함
+class LedgerSummaryCostTests(TestCase):
+    def setUp(self):
+        for currency, rate in [("KRW", "1"), ("USD", "0.000721")]:
+            ExchangeRate.objects.create(base_currency="KRW", target_currency=currency, rate=Decimal(rate))
+        invalidate_rates()
+        self.user = User.objects.create(username="summary", nickname="summary")
+        ExchangeProfile.objects.create(user=self.user, exchange_country="미국", exchange_period="5개월")
+        DetailProfile.objects.create(user=self.user, monthly_spend_in_korea=Decimal("1000000"))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _add_entries(self, count):
+        for _ in range(count):
+            for category, currency in [("FOOD", "USD"), ("HOUSING", "KRW")]:
+                response = self.client.post("/ledgers/fill/", {
+                    "entry_type": "EXPENSE",
+                    "date": date.today().isoformat(),
+                    "category": category,
+                    "payment_method": "CARD",
+                    "amount": "10.00" if currency == "USD" else "10000",
+                    "currency_code": currency,
+                }, format="json")
+                self.assertEqual(response.status_code, 201)
+
+    def _summary_queries(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get("/summaries/ledger-summary/")
+        self.assertEqual(response.status_code, 200)
+        return response, [query["sql"] for query in captured.captured_queries]
+
+    def test_summary_does_not_read_ledger_entries(self):
+        self._add_entries(2)
+        response, small = self._summary_queries()
+        self.assertFalse([sql for sql in small if "ledgers_ledgerentry" in sql])
+
+        self._add_entries(10)
+        response, large = self._summary_queries()
+        self.assertEqual(len(small), len(large))
+
+        food = next(item for item in response.data["data"]["categories"] if item["code"] == "FOOD")
+        self.assertEqual(Decimal(food["foreign_amount"]), Decimal("120.00"))
+
+
+# 스냅샷: 내용이 같으면 새 행을 만들지 않고, 사용자별 is_latest는 한 행, 정리 때 최신 행은 남김
+class SnapshotTests(TestCase):
+    def setUp(self):
+        ExchangeRate.objects.create(base_currency="KRW", target_currency="KRW", rate=Decimal("1"))
+        invalidate_rates()
+        self.user = User.objects.create(username="snapshot", nickname="snapshot")
+        ExchangeProfile.objects.create(user=self.user, exchange_country="한국", exchange_period="5개월")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _run_jobs(self):
+        call_command("run_worker", "--once", "--worker-id", "test", stdout=StringIO())
+
+    def _save_profile(self, method="put"):
+        body = {"monthly_spend_in_korea": "1000000"}
+        response = getattr(self.client, method)("/summaries/snapshot/", body, format="json")
+        self.assertIn(response.status_code, (200, 201))
+        self._run_jobs()
+        return response
+
+    def _add_expense(self, amount):
+        self.client.post("/ledgers/fill/", {
+            "entry_type": "EXPENSE",
+            "date": date.today().isoformat(),
+            "category": "FOOD",
+            "payment_method": "CARD",
+            "amount": amount,
+            "currency_code": "KRW",
+        }, format="json")
+
+    def test_identical_put_creates_no_new_row(self):
+        self._save_profile(method="post")
+        first = SummarySnapshot.objects.get(user=self.user)
+
+        response = self._save_profile()
+        self.assertEqual(SummarySnapshot.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(response.data["data"]["snapshot_id"], first.id)
+
+    def test_one_latest_row_per_user(self):
+        self._save_profile(method="post")
+        for amount in ["10000", "20000"]:
+            self._add_expense(amount)
+            self._save_profile()
+
+        self.assertEqual(SummarySnapshot.objects.filter(user=self.user).count(), 3)
+        latest = SummarySnapshot.objects.filter(user=self.user, is_latest=True)
+        self.assertEqual(latest.count(), 1)
+        self.assertEqual(latest.get().id, SummarySnapshot.objects.filter(user=self.user).latest("id").id)
+
+    def test_compaction_keeps_latest_and_referenced_rows(self):
+        self._save_profile(method="post")
+        favorited = SummarySnapshot.objects.get(user=self.user)
+        FeedFavorite.objects.create(user=self.user, snapshot=favorited)
+        for amount in ["10000", "20000"]:
+            self._add_expense(amount)
+            self._save_profile()
+        latest = SummarySnapshot.objects.get(user=self.user, is_latest=True)
 
-# Create your tests here.
+        self.assertEqual(compact_snapshots(batch_size=1), 1)
+        self.assertEqual(
+            set(SummarySnapshot.objects.filter(user=self.user).values_list("id", flat=True)),
+            {favorited.id, latest.id},
+        )
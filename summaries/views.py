@@ -12,7 +12,10 @@ from .models import DetailProfile, SummarySnapshot
 from .serializers import (DetailProfileSerializer, LedgerSummarySerializer)
 from ledgers.models import LedgerEntry
 from rates.views import convert_to_krw, convert_from_krw
+from ledgers.aggregates import convert_groups, monthly_groups
+from rates.money import Money
 from budgets.models import BaseBudget
+from jobs.queue import enqueue
 
 
 INCLUDED_CATEGORIES = [
@@ -101,13 +104,10 @@ class DetailProfileView(APIView):
             return bad("세부 프로필 생성 실패", serializer.errors)
 
         detail_profile = serializer.save(user=request.user)
-        snapshot = self._create_snapshot(request.user, detail_profile)
+        job = self._enqueue_snapshot(request.user, detail_profile)
 
-        data = {
-            "detail_profile_id": detail_profile.id,
-            "snapshot_id": snapshot.id,
-        }
-        return ok("세부 프로필 생성 및 가계부 요약본 스냅샷 생성 완료", data, status.HTTP_201_CREATED)
+        data = self._snapshot_data(request.user, detail_profile, job)
+        return ok("세부 프로필 생성 완료, 가계부 요약본 스냅샷 생성 요청됨", data, status.HTTP_201_CREATED)
 
     @transaction.atomic
     def put(self, request):
@@ -124,50 +124,35 @@ class DetailProfileView(APIView):
             return bad("세부 프로필 수정 실패", serializer.errors)
 
         detail_profile = serializer.save()
-        snapshot = self._create_snapshot(request.user, detail_profile)
+        job = self._enqueue_snapshot(request.user, detail_profile)
 
-        data = {
-            "detail_profile_id": detail_profile.id,
-            "snapshot_id": snapshot.id,
-        }
-        return ok("세부 프로필 수정 및 가계부 요약본 스냅샷 생성 완료", data)
-
-    def _sum_ledger_for_user(self, user, foreign_currency):
-        entries = (
-            LedgerEntry.objects
-            .filter(
-                user=user,
-                entry_type=LedgerEntry.EntryType.EXPENSE,
-                category__in=INCLUDED_CATEGORIES,
-            )
-        )
+        data = self._snapshot_data(request.user, detail_profile, job)
+        return ok("세부 프로필 수정 완료, 가계부 요약본 스냅샷 생성 요청됨", data)
 
-        total_foreign = Decimal("0")
-        total_krw = Decimal("0")
-
-        for entry in entries:
-            if entry.amount_converted and entry.converted_currency_code == "KRW":
-                krw_at_entry = entry.amount_converted
-            else:
-                if entry.currency_code == "KRW":
-                    krw_at_entry = entry.amount
-                else:
-                    converted = convert_to_krw(entry.amount, entry.currency_code)
-                    if converted is None:
-                        continue
-                    krw_at_entry = converted
-            total_krw += krw_at_entry
-
-            if entry.currency_code == foreign_currency:
-                foreign_at_entry = entry.amount
-            else:
-                foreign_at_entry = convert_from_krw(krw_at_entry, foreign_currency)
-            if foreign_at_entry is not None:
-                total_foreign += foreign_at_entry
+    # 전체 지출 내역을 훑는 스냅샷 생성은 워커(manage.py run_worker)에서 실행
+    # 프로필 저장과 같은 트랜잭션에서 등록 -> 저장이 롤백되면 작업도 등록되지 않음
+    def _enqueue_snapshot(self, user, detail_profile):
+        return enqueue(
+            "summaries.tasks.create_snapshot",
+            {"user_id": user.id, "detail_profile_id": detail_profile.id},
+        )
 
-        total_foreign = total_foreign.quantize(Decimal("0.01"))
-        total_krw = total_krw.quantize(Decimal("0.01"))
-        return total_foreign, total_krw
+    # 응답 (기존 클라이언트 호환)
+    # - snapshot_id: 요청 시점의 최신 스냅샷 id (아직 한 번도 만들어지지 않았으면 null)
+    #   새 스냅샷은 snapshot_job_id 작업이 끝난 뒤 만들어지고, 내용이 같으면 기존 스냅샷이 그대로 유지됨
+    # - snapshot_job_id: 스냅샷 생성 작업 id
+    def _snapshot_data(self, user, detail_profile, job):
+        latest_id = (
+            SummarySnapshot.objects
+            .filter(user=user, is_latest=True)
+            .values_list("id", flat=True)
+            .first()
+        )
+        return {
+            "detail_profile_id": detail_profile.id,
+            "snapshot_id": latest_id,
+            "snapshot_job_id": job.id,
+        }
 
     def _get_detail_profile_or_none(self, user):
         try:
@@ -175,39 +160,6 @@ class DetailProfileView(APIView):
         except DetailProfile.DoesNotExist:
             return None
 
-    def _create_snapshot(self, user, detail_profile):
-        exchange_profile = getattr(user, "exchange_profile", None)
-
-        foreign_currency = resolve_foreign_currency(exchange_profile)
-        total_foreign, total_krw = self._sum_ledger_for_user(user, foreign_currency)
-
-        months = extract_months(exchange_profile)
-
-        monthly_foreign = (total_foreign / months).quantize(Decimal("0.01"))
-        monthly_krw = (total_krw / months).quantize(Decimal("0.01"))
-
-        snapshot = SummarySnapshot.objects.create(
-            user=user,
-            exchange_profile=exchange_profile,
-            detail_profile=detail_profile,
-            snapshot_nickname=getattr(user, "nickname", "") or "",
-            snapshot_gender=user.get_gender_display() if hasattr(user, "get_gender_display") else "",
-            snapshot_exchange_country=getattr(exchange_profile, "exchange_country", "") or "",
-            snapshot_exchange_university=getattr(getattr(exchange_profile, "exchange_univ", None), "univ_name", "") or "",
-            snapshot_exchange_type=(
-                exchange_profile.get_exchange_type_display()
-                if exchange_profile and exchange_profile.exchange_type
-                else ""
-            ),
-            snapshot_exchange_semester=getattr(exchange_profile, "exchange_semester", "") or "",
-            snapshot_exchange_period=getattr(exchange_profile, "exchange_period", "") or "",
-            living_expense_foreign_amount=monthly_foreign,
-            living_expense_foreign_currency=foreign_currency,
-            living_expense_krw_amount=monthly_krw,
-            living_expense_krw_currency="KRW",
-        )
-        return snapshot
-
 
 class LedgerSummaryView(APIView):
     permission_classes = [IsAuthenticated]
@@ -257,72 +209,56 @@ class LedgerSummaryView(APIView):
         return ok("가계부 요약본 조회 성공", serializer.data)
 
     def _build_category_summaries(self, user, foreign_currency):
-        grouped = {}
-        for code in INCLUDED_CATEGORIES:
-            grouped[code] = {
-                "code": code,
-                "label": self.LABEL_MAP.get(code, code),
-                "foreign_amount": Decimal("0"),
-                "foreign_currency": foreign_currency,
-                "krw_amount": Decimal("0"),
-                "krw_currency": "KRW",
-                "current_rate_krw_amount": Decimal("0"),
+        # 루프 안에서는 정수 Money로 합산하고 응답 직전에 Decimal로 변환
+        sums = {
+            code: {
+                "foreign_amount": Money.zero(foreign_currency),
+                "krw_amount": Money.zero("KRW"),
+                "current_rate_krw_amount": Money.zero("KRW"),
             }
+            for code in INCLUDED_CATEGORIES
+        }
 
-        entries = (
-            LedgerEntry.objects
-            .filter(
-                user=user,
-                entry_type=LedgerEntry.EntryType.EXPENSE,
-                category__in=INCLUDED_CATEGORIES,
-            )
-        )
+        total_foreign = Money.zero(foreign_currency)
+        total_krw = Money.zero("KRW")
+        total_current_krw = Money.zero("KRW")
 
-        total_foreign = Decimal("0")
-        total_krw = Decimal("0")
-        total_current_krw = Decimal("0")
+        # 가계부 쓰기 때 갱신되는 월별 합계에서 카테고리 x 통화별 전체 기간 합계를 가져옴 (원장 전체를 읽지 않음)
+        # 현재 환율 원화는 원본 통화 합계에 환율 스냅샷 한 번으로 계산, 등록 당시 원화/외화는 저장된 환산 합계 사용
+        # -> 조회 비용은 카테고리 x 통화 그룹 수에만 비례 (원장 항목 수와 무관)
+        groups = monthly_groups(user, entry_type=LedgerEntry.EntryType.EXPENSE, categories=INCLUDED_CATEGORIES)
+        for group in convert_groups(groups, foreign_currency):
+            item = sums[group["category"]]
 
-        for entry in entries:
-            item = grouped[entry.category]
+            if group["current_krw"] is not None:
+                current_money = Money.from_decimal(group["current_krw"], "KRW")
+                item["current_rate_krw_amount"] += current_money
+                total_current_krw += current_money
 
-            if entry.currency_code == "KRW":
-                current_krw = entry.amount
-            else:
-                current_krw = convert_to_krw(entry.amount, entry.currency_code)
-            if current_krw is not None:
-                item["current_rate_krw_amount"] += current_krw
-                total_current_krw += current_krw
+            if group["entry_krw"] is not None:
+                krw_money = Money.from_decimal(group["entry_krw"], "KRW")
+                item["krw_amount"] += krw_money
+                total_krw += krw_money
 
-            if entry.amount_converted and entry.converted_currency_code == "KRW":
-                krw_at_entry = entry.amount_converted
-            else:
-                if entry.currency_code == "KRW":
-                    krw_at_entry = entry.amount
-                else:
-                    krw_at_entry = convert_to_krw(entry.amount, entry.currency_code)
-            if krw_at_entry is not None:
-                item["krw_amount"] += krw_at_entry
-                total_krw += krw_at_entry
-
-            if entry.currency_code == foreign_currency:
-                item["foreign_amount"] += entry.amount
-                total_foreign += entry.amount
-            else:
-                if krw_at_entry is not None:
-                    foreign_val = convert_from_krw(krw_at_entry, foreign_currency)
-                    if foreign_val is not None:
-                        item["foreign_amount"] += foreign_val
-                        total_foreign += foreign_val
+            if group["entry_foreign"] is not None:
+                foreign_money = Money.from_decimal(group["entry_foreign"], foreign_currency)
+                item["foreign_amount"] += foreign_money
+                total_foreign += foreign_money
 
         result = []
         for code in INCLUDED_CATEGORIES:
-            item = grouped[code]
-            item["foreign_amount"] = item["foreign_amount"].quantize(Decimal("0.01"))
-            item["krw_amount"] = item["krw_amount"].quantize(Decimal("0.01"))
-            item["current_rate_krw_amount"] = item["current_rate_krw_amount"].quantize(Decimal("0.01"))
-            result.append(item)
+            item = sums[code]
+            result.append({
+                "code": code,
+                "label": self.LABEL_MAP.get(code, code),
+                "foreign_amount": item["foreign_amount"].to_decimal(),
+                "foreign_currency": foreign_currency,
+                "krw_amount": item["krw_amount"].to_decimal(),
+                "krw_currency": "KRW",
+                "current_rate_krw_amount": item["current_rate_krw_amount"].to_decimal(),
+            })
 
-        return result, total_foreign, total_krw, total_current_krw
+        return result, total_foreign.to_decimal(), total_krw.to_decimal(), total_current_krw.to_decimal()
 
     def _build_dispatch_cost(self, user, foreign_currency):
         base_budget = BaseBudget.objects.filter(budget__user=user).first()